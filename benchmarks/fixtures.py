@@ -0,0 +1,153 @@
+"""Event fixtures for the benchmarks.
+
+A fixture is a directory holding total.html (the total1.php results page),
+personal_<n>.html (one personal1.php page per team) and index.json, which maps
+each personal page's query string to its file. Fixtures are either generated
+synthetically in bridge.co.il markup or recorded from a live event:
+
+    python benchmarks/fixtures.py record URL benchmarks/fixtures/my-event
+
+No recorded event ships with the repository yet, so until one is recorded into
+benchmarks/fixtures/ the benchmarks only measure the synthetic markup below.
+"""
+import os
+import sys
+import json
+import random
+import argparse
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bridge_scraper as scraper
+
+# name -> (teams, rounds in schedule, rounds played, boards per match, matches per day).
+# Events with matches per day get a two-row results header: day cells spanning their rounds
+# above the round numbers, with the other columns spanning both rows.
+SYNTHETIC_EVENTS = {
+    "small": (12, 28, 14, 8, None),
+    "medium": (40, 28, 28, 12, None),
+    "large": (120, 28, 28, 12, None),
+    "swiss": (120, 44, 44, 8, None),
+    "daily": (40, 30, 18, 8, (8, 8, 7, 7)),
+}
+
+CONTRACTS = ["1NT", "2H", "2S x", "3NT", "4H", "4S", "5D x", "6NT", "NP"]
+LEADS = ["SA", "H5", "D7", "CK", "ST", "H2"]
+
+def _vp_split(rnd):
+    home = round(rnd.uniform(0, 20), 2)
+    return home, round(20 - home, 2)
+
+def _vp_cell(value):
+    return f"<td><bdo>{value:.2f}</bdo></td>".replace('.', ',')
+
+def _results_header(rounds, matches_per_day=None):
+    if not matches_per_day:
+        return ("<tr><th>#</th><th>Team</th><th>Players</th><th>Club</th>"
+                + "".join(f"<th>{r + 1}</th>" for r in range(rounds)) + "<th>Total</th><th>Penalty</th></tr>")
+    return ("<tr><th rowspan='2'>#</th><th rowspan='2'>Team</th><th rowspan='2'>Players</th><th rowspan='2'>Club</th>"
+            + "".join(f"<th colspan='{count}'>Day {day}</th>" for day, count in enumerate(matches_per_day, 1))
+            + "<th rowspan='2'>Total</th><th rowspan='2'>Penalty</th></tr>"
+            + "<tr>" + "".join(f"<th>{r + 1}</th>" for r in range(rounds)) + "</tr>")
+
+def generate_event(directory, teams=40, rounds=28, played=28, boards=12, seed=0, matches_per_day=None):
+    rnd = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    names = [f"Team {i + 1}" for i in range(teams)]
+    vps = [[0.0] * rounds for _ in names]
+    opponents = [[None] * rounds for _ in names]
+    for r in range(played):
+        order = list(range(teams))
+        rnd.shuffle(order)
+        for home, away in zip(order[::2], order[1::2]):
+            vps[home][r], vps[away][r] = _vp_split(rnd)
+            opponents[home][r], opponents[away][r] = away, home
+
+    index = {}
+    rows = [_results_header(rounds, matches_per_day)]
+    for t, name in enumerate(names):
+        query = f"event=1&team={t + 1}"
+        index[query] = f"personal_{t + 1}.html"
+        penalty = rnd.choice(["", "", "", "-1", "-0,5"])
+        rows.append(
+            f"<tr><td>{t + 1}</td><td><a href='personal1.php?{query}'>{name}</a></td><td>Players</td><td>Club</td>"
+            + "".join(_vp_cell(vps[t][r]) if r < played else "<td></td>" for r in range(rounds))
+            + f"<td><bdo>{sum(vps[t]):.2f}</bdo></td><td><bdo>{penalty}</bdo></td></tr>"
+        )
+
+        tables = []
+        for r in range(played):
+            if opponents[t][r] is None:
+                continue
+            trs = [f"<tr><td colspan='10'><a href='match1.php?event=1&round={r + 1}&team={t + 1}'>Match {r + 1}</a></td></tr>",
+                   "<tr><td colspan='10'>Open room / Closed room</td></tr>",
+                   "<tr><th colspan='5'>Open</th><th colspan='5'>Closed</th></tr>",
+                   "<tr><th>NS</th><th>EW</th><th>Board</th><th>Contract</th><th>By</th><th>Lead</th><th>Tricks</th><th>IMP</th><th></th><th></th></tr>"]
+            for board in range(1, boards + 1):
+                contract = rnd.choice(CONTRACTS)
+                score = str(rnd.choice([50, 100, 110, 140, 420, 430, 620, 1430]))
+                ns, ew = (score, "") if rnd.random() < 0.5 else ("", score)
+                imp = str(rnd.randint(-13, 13))
+                trs.append(
+                    f"<tr><td class='resns'>{ns}</td><td class='resew'>{ew}</td>"
+                    f"<td class='rank'><a href='board1.php?board={board}'>{board}</a></td>"
+                    f"<td class='contract'>{contract}</td><td>{rnd.choice('NESW')}</td>"
+                    f"<td class='lead'><bdo>{rnd.choice(LEADS)}</bdo></td><td>{rnd.randint(6, 13)}</td>"
+                    f"<td class='res'>{imp}</td><td></td><td></td></tr>"
+                )
+            tables.append("<table class='mpersonal'>" + "".join(trs) + "</table>")
+        with open(os.path.join(directory, index[query]), "w", encoding="utf-8") as f:
+            f.write(f"<html><head><meta charset='utf-8'></head><body><h2>{name}</h2>" + "<br>".join(tables) + "</body></html>")
+
+    with open(os.path.join(directory, "total.html"), "w", encoding="utf-8") as f:
+        f.write("<html><head><meta charset='utf-8'></head><body>"
+                f"<table class='eventInfo'><tr class='eventInfoTitle'><td>Synthetic event, {teams} teams</td></tr></table>"
+                "<table class='resultsTable'>" + "".join(rows) + "</table></body></html>")
+    with open(os.path.join(directory, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    return directory
+
+# Save a live event's results page and every personal page it links to
+def record_event(url, directory):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "total.html"), "w", encoding="utf-8") as f:
+        f.write(scraper.fetch_page(url, scraper.RESULTS_HEADERS))
+    _, teams = scraper.scrape_team_data(url)
+
+    index = {}
+    urls = [scraper.personal_page_url(team["personal_url"], url) for team in teams or []]
+    for i, html, _, error in scraper.fetch_pages_concurrently(urls, scraper.PERSONAL_HEADERS):
+        if error is not None:
+            print(f"Failed to record {urls[i]}: {error}", file=sys.stderr)
+            continue
+        index[urlsplit(urls[i]).query] = f"personal_{i + 1}.html"
+        with open(os.path.join(directory, index[urlsplit(urls[i]).query]), "w", encoding="utf-8") as f:
+            f.write(html)
+    with open(os.path.join(directory, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    return directory
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate or record benchmark event fixtures.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    synthetic = commands.add_parser("synthetic", help="generate a synthetic event")
+    synthetic.add_argument("directory")
+    synthetic.add_argument("--teams", type=int, default=40)
+    synthetic.add_argument("--rounds", type=int, default=28)
+    synthetic.add_argument("--played", type=int, default=28)
+    synthetic.add_argument("--boards", type=int, default=12)
+    synthetic.add_argument("--seed", type=int, default=0)
+    synthetic.add_argument("--days", help="comma-separated matches per day, for a two-row results header")
+    record = commands.add_parser("record", help="record a live event")
+    record.add_argument("url")
+    record.add_argument("directory")
+    args = parser.parse_args(argv)
+
+    if args.command == "synthetic":
+        matches_per_day = [int(count) for count in args.days.split(",")] if args.days else None
+        generate_event(args.directory, args.teams, args.rounds, args.played, args.boards, args.seed, matches_per_day)
+    else:
+        record_event(args.url, args.directory)
+
+if __name__ == "__main__":
+    main()
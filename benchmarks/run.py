@@ -0,0 +1,206 @@
+"""Offline benchmarks for the scraping and ranking paths.
+
+Each event fixture is served by a local stand-in server and measured for:
+parse throughput (pages/s and games/s), end-to-end load time with a cold and a
+warm page cache, standings build time and ranking latency per round, and
+memory during a cold load: the Python-heap peak seen by tracemalloc, and the
+peak rise in process RSS sampled from /proc (Linux only), which also counts
+the parsers' native trees such as lxml's libxml2 documents. Memory freed by
+earlier loads is reused, so the RSS rise is a lower bound on a fresh
+process's. Cold loads are also timed with personal pages fetched and parsed
+one at a time (get_all_match_details), parsed on the fetch threads, and
+parsed on process pools of each --parse-workers size. Synthetic
+events are generated on each run; recorded fixtures are picked up from
+benchmarks/fixtures/.
+
+    python benchmarks/run.py --events small,medium,large --parse-workers 1,2,4 --json bench_output.json
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import threading
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("BRIDGEFOLLOW_CACHE_DIR", tempfile.mkdtemp(prefix="bridgefollow-bench-cache-"))
+sys.path.insert(0, ROOT)
+
+import bridge_scraper as scraper
+from bridgeFollow import GameStore, Standings
+from fixtures import SYNTHETIC_EVENTS, generate_event
+from server import FixtureServer
+
+RECORDED_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+
+def bench_parse(directory):
+    with open(os.path.join(directory, "index.json"), encoding="utf-8") as f:
+        pages = sorted(json.load(f).values())
+    with open(os.path.join(directory, "total.html"), encoding="utf-8") as f:
+        total = f.read()
+    personal = []
+    for name in pages:
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            personal.append(f.read())
+
+    start = time.perf_counter()
+    scraper.parse_results_page(total)
+    games = 0
+    for i, html in enumerate(personal):
+        games += len(scraper.parse_match_details(f"Team {i + 1}", html))
+    seconds = time.perf_counter() - start
+    return {
+        "pages": len(personal) + 1,
+        "games": games,
+        "parse_s": seconds,
+        "pages_per_s": (len(personal) + 1) / seconds,
+        "games_per_s": games / seconds
+    }
+
+def load_event(results_url):
+    _, teams = scraper.scrape_team_data(results_url)
+    games = scraper.load_all_match_details(teams, results_url)
+    return teams, GameStore.from_records(games)
+
+# Resident set size of this process in bytes, or None where /proc is unavailable
+def _rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+# Peak rise in RSS while fn runs, sampled every few milliseconds; NaN without /proc
+def rss_peak_delta(fn, interval=0.005):
+    baseline = _rss()
+    if baseline is None:
+        fn()
+        return float("nan")
+    peak = [baseline]
+    done = threading.Event()
+    def sample():
+        while not done.wait(interval):
+            peak[0] = max(peak[0], _rss())
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        fn()
+    finally:
+        done.set()
+        sampler.join()
+    return max(peak[0], _rss()) - baseline
+
+def bench_load(results_url):
+    cache = scraper.get_page_cache()
+    cache.clear()
+    start = time.perf_counter()
+    teams, _ = load_event(results_url)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    load_event(results_url)
+    warm = time.perf_counter() - start
+
+    # RSS is sampled on its own cold load so tracemalloc's bookkeeping is not counted
+    cache.clear()
+    rss_delta = rss_peak_delta(lambda: load_event(results_url))
+
+    cache.clear()
+    tracemalloc.start()
+    load_event(results_url)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return teams, {"load_cold_s": cold, "load_warm_s": warm, "py_heap_peak_mb": peak / 2 ** 20, "rss_peak_delta_mb": rss_delta / 2 ** 20}
+
+# Cold-cache detail loads: serial, threaded, then pipelined on each process pool size.
+# Pools are warmed with an untimed load so worker start-up is not counted.
+def bench_parse_scaling(results_url, teams, parse_workers):
+    cache = scraper.get_page_cache()
+    cache.clear()
+    start = time.perf_counter()
+    for team in teams:
+        scraper.get_all_match_details(team["name"], team["personal_url"], results_url)
+    result = {"serial_s": time.perf_counter() - start}
+    
+    for workers in [0] + parse_workers:
+        if workers:
+            cache.clear()
+            list(scraper.iter_match_details(teams, results_url, parse_workers=workers))
+        cache.clear()
+        start = time.perf_counter()
+        list(scraper.iter_match_details(teams, results_url, parse_workers=workers))
+        result[f"processes_{workers}_s" if workers else "threads_s"] = time.perf_counter() - start
+    return result
+
+def bench_rankings(teams, repeat=20):
+    round_count = max(len(team["matches"]) for team in teams)
+    start = time.perf_counter()
+    standings = Standings(teams, round_count)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for round_index in range(round_count):
+            standings.ranking_frame(round_index)
+    per_round = (time.perf_counter() - start) / (repeat * round_count)
+    return {"standings_build_ms": build * 1000, "ranking_per_round_ms": per_round * 1000}
+
+def run_event(name, directory, parse_workers):
+    result = {"event": name}
+    result.update(bench_parse(directory))
+    with FixtureServer(directory) as server:
+        teams, load = bench_load(server.results_url)
+        result.update(bench_parse_scaling(server.results_url, teams, parse_workers))
+    result.update(load)
+    result.update(bench_rankings(teams))
+    result["teams"] = len(teams)
+    return result
+
+def print_table(results, columns):
+    rows = [[name for name, _ in columns]] + [[fmt.format(result[name]) for name, fmt in columns] for result in results]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    for row in rows:
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark scraping and ranking against local event fixtures.")
+    parser.add_argument("--events", default=",".join(SYNTHETIC_EVENTS), help="comma-separated synthetic event sizes")
+    parser.add_argument("--no-recorded", action="store_true", help="skip recorded fixtures in benchmarks/fixtures/")
+    parser.add_argument("--parse-workers", default="1,2,4", help="comma-separated process pool sizes for the parse scaling runs")
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON")
+    args = parser.parse_args(argv)
+
+    events = []
+    work_dir = tempfile.mkdtemp(prefix="bridgefollow-bench-")
+    for name in filter(None, args.events.split(",")):
+        teams, rounds, played, boards, matches_per_day = SYNTHETIC_EVENTS[name]
+        events.append((name, generate_event(os.path.join(work_dir, name), teams, rounds, played, boards, matches_per_day=matches_per_day)))
+    recorded = []
+    if not args.no_recorded and os.path.isdir(RECORDED_DIR):
+        for name in sorted(os.listdir(RECORDED_DIR)):
+            if os.path.exists(os.path.join(RECORDED_DIR, name, "index.json")):
+                recorded.append(name)
+                events.append((name, os.path.join(RECORDED_DIR, name)))
+    if not args.no_recorded and not recorded:
+        print("No recorded fixtures in benchmarks/fixtures/, so every event is synthetic markup. "
+              "Record one with: python benchmarks/fixtures.py record URL benchmarks/fixtures/NAME", file=sys.stderr)
+
+    parse_workers = [int(workers) for workers in filter(None, args.parse_workers.split(","))]
+    results = [run_event(name, directory, parse_workers) for name, directory in events]
+    print_table(results, [
+        ("event", "{}"), ("teams", "{}"), ("pages_per_s", "{:.1f}"), ("games_per_s", "{:.0f}"),
+        ("load_cold_s", "{:.2f}"), ("load_warm_s", "{:.2f}"), ("standings_build_ms", "{:.2f}"),
+        ("ranking_per_round_ms", "{:.3f}"), ("py_heap_peak_mb", "{:.1f}"),
+        ("rss_peak_delta_mb", "{:.1f}")
+    ])
+    print()
+    print_table(results, [("event", "{}"), ("serial_s", "{:.2f}"), ("threads_s", "{:.2f}")]
+                + [(f"processes_{workers}_s", "{:.2f}") for workers in parse_workers])
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"parser": scraper.HTML_PARSER, "cpus": os.cpu_count(), "recorded": recorded, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Local stand-in for bridge.co.il that serves a fixture directory.
+
+total1.php returns total.html and personal1.php returns the page that the
+fixture's index.json maps its query string to. Responses carry an ETag so the
+page cache's conditional requests can be exercised.
+"""
+import os
+import json
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+class FixtureServer:
+    def __init__(self, directory, host="127.0.0.1", port=0):
+        with open(os.path.join(directory, "index.json"), encoding="utf-8") as f:
+            index = json.load(f)
+        self.directory = directory
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                parts = urlsplit(self.path)
+                if parts.path.endswith("total1.php"):
+                    name = "total.html"
+                elif parts.path.endswith("personal1.php") and parts.query in index:
+                    name = index[parts.query]
+                else:
+                    self.send_error(404)
+                    return
+
+                with open(os.path.join(directory, name), "rb") as f:
+                    body = f.read()
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def results_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/viewer/total1.php?event=1"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -1,8 +1,436 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import json
 import time
-import requests
-from bs4 import BeautifulSoup
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, CancelledError
+import bridge_scraper as scraper
+import bridge_archive as archive
+import bridge_snapshot as snapshots
+
+LIVE_CHECK_SECONDS = 5
+EVENT_TTL = 30 * 60
+EVENT_MEMORY_BUDGET = 512 * 1024 * 1024
+FILL_BATCH = 4  # teams merged into the game store per background fill step
+SIMULATIONS = 20000  # most tournaments simulated per projection
+MIN_SIMULATIONS = 2000
+SIMULATION_BUDGET = 8 * 10 ** 6  # tournaments x teams x remaining rounds per projection, bounds its cost
+VP_PER_MATCH = 20
+
+# One background poller per results URL, shared by every session following that event
+@st.cache_resource
+def get_event_poller(results_url):
+    return scraper.EventPoller(results_url)
+
+GAME_COLUMNS = ["team", "match", "board", "contract", "score", "imp", "lead"]
+
+# Columnar store of scraped games. Text columns are categorical, score and IMP are numeric,
+# and row positions are indexed by (team, match) and (match, board) once at build time.
+class GameStore:
+    def __init__(self, frame):
+        self.frame = frame
+        self._by_team_match = frame.groupby(["team", "match"], observed=True, sort=False).indices
+        self._by_match_board = frame.groupby(["match", "board"], observed=True, sort=False).indices
+        self._board_summary = None
+
+    @classmethod
+    def from_records(cls, games):
+        frame = pd.DataFrame.from_records(games, columns=GAME_COLUMNS)
+        return cls(cls._compact(frame))
+
+    @staticmethod
+    def _compact(frame):
+        frame = frame.astype({
+            "team": "category",
+            "match": "int16",
+            "board": "category",
+            "contract": "category",
+            "lead": "category"
+        })
+        for column in ("score", "imp"):
+            if not pd.api.types.is_numeric_dtype(frame[column]):
+                frame[column] = pd.to_numeric(frame[column].astype(str).str.replace(',', '.'), errors='coerce')
+            frame[column] = frame[column].astype("float32")
+        return frame.reset_index(drop=True)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _rows(self, index, key):
+        positions = index.get(key)
+        if positions is None:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[positions]
+
+    def games_for(self, team, match):
+        return self._rows(self._by_team_match, (team, match))
+
+    def board_results(self, match, board):
+        return self._rows(self._by_match_board, (match, board))
+
+    # Field distributions for every board, built on first use
+    def board_summary(self):
+        if self._board_summary is None:
+            self._board_summary = BoardSummary(self.frame)
+        return self._board_summary
+
+    def records(self):
+        return self.frame.astype({"team": object, "board": object, "contract": object, "lead": object}).to_dict("records")
+
+    # Replace the games of the given teams and keep rows in the order of team_order
+    def replace_teams(self, teams, games, team_order):
+        kept = self.frame[~self.frame["team"].isin(teams) & self.frame["team"].isin(team_order)]
+        frame = pd.concat([
+            kept.astype({"team": object, "board": object, "contract": object, "lead": object}),
+            pd.DataFrame.from_records(games, columns=GAME_COLUMNS)
+        ], ignore_index=True)
+        position = {name: i for i, name in enumerate(team_order)}
+        frame = frame.iloc[frame["team"].map(position).argsort(kind="stable")]
+        return GameStore(self._compact(frame))
+
+# Field distributions for every (match, board), aggregated once per GameStore: contract and
+# lead frequencies and the spread of NS scores and IMPs. Lookups are index seeks on sorted keys.
+class BoardSummary:
+    def __init__(self, frame):
+        keys = ["match", "board"]
+        self.contracts = frame.groupby(keys + ["contract"], observed=True).size().sort_index()
+        self.leads = frame.groupby(keys + ["lead"], observed=True).size().sort_index()
+        self.scores = frame.groupby(keys, observed=True)["score"].agg(["size", "min", "max", "mean", "median", "std"]).sort_index()
+        self.imps = frame.groupby(keys, observed=True)["imp"].agg(["min", "max", "mean"]).sort_index()
+
+    @staticmethod
+    def _frequencies(counts, match, board, label):
+        try:
+            counts = counts.loc[(match, board)]
+        except KeyError:
+            return pd.DataFrame(columns=[label, "Tables", "Share"])
+        counts = counts.sort_values(ascending=False, kind="stable")
+        return pd.DataFrame({
+            label: counts.index.astype(str),
+            "Tables": counts.to_numpy(),
+            "Share": counts.to_numpy() / counts.sum()
+        })
+
+    def contract_frequencies(self, match, board):
+        return self._frequencies(self.contracts, match, board, "Contract")
+
+    def lead_frequencies(self, match, board):
+        return self._frequencies(self.leads, match, board, "Lead")
+
+    # Score and IMP statistics for one board, or None if no table played it
+    def spread(self, match, board):
+        try:
+            scores = self.scores.loc[(match, board)]
+            imps = self.imps.loc[(match, board)]
+        except KeyError:
+            return None
+        return {
+            "tables": int(scores["size"]),
+            "score_min": scores["min"], "score_max": scores["max"],
+            "score_mean": scores["mean"], "score_median": scores["median"], "score_std": scores["std"],
+            "imp_min": imps["min"], "imp_max": imps["max"], "imp_mean": imps["mean"]
+        }
+
+# Probability of each team finishing in each position (teams x positions), from totals after
+# `played` rounds and `remaining` rounds still to play. Each simulated round pairs the teams at
+# random and draws one side's VPs from the VPs scored so far (both sides' shares of VP_PER_MATCH),
+# the other side getting the rest; with an odd field the unpaired team draws its own VPs.
+# Simulations are batched per round: VPs for every tournament's table slots are drawn at once,
+# and each tournament gets its own random pairing, a per-row permutation from sorting random keys.
+# Ties keep results-table order like Standings. By default the number of tournaments is sized by
+# simulation_count so that the work stays within SIMULATION_BUDGET.
+def project_positions(match_vps, totals, played, remaining, simulations=None, seed=None):
+    rng = np.random.default_rng(seed)
+    team_count = len(totals)
+    simulations = simulations or simulation_count(team_count, remaining)
+    observed = match_vps[:, :played].ravel()
+    if observed.size == 0:
+        observed = np.array([VP_PER_MATCH / 2])
+    distribution = np.concatenate([observed, VP_PER_MATCH - observed]).astype(np.float32)
+    
+    half = team_count // 2
+    final = np.tile(np.asarray(totals, dtype=np.float32), (simulations, 1))
+    slot_vps = np.empty((simulations, team_count), dtype=np.float32)
+    row_offsets = np.arange(0, simulations * team_count, team_count)[:, None]
+    for _ in range(remaining):
+        vps = distribution[rng.integers(0, distribution.size, size=(simulations, team_count - half))]
+        slot_vps[:, :half] = vps[:, :half]
+        slot_vps[:, half:2 * half] = VP_PER_MATCH - vps[:, :half]
+        if team_count % 2:
+            slot_vps[:, -1] = vps[:, -1]
+        # Slots i and i + half play each other; team j takes slot pairing[j]
+        pairing = np.argsort(rng.random((simulations, team_count), dtype=np.float32), axis=1)
+        final += slot_vps.ravel()[pairing + row_offsets]
+    
+    teams = np.arange(team_count)
+    rows = np.arange(simulations)[:, None]
+    order = np.argsort(-final, axis=1, kind="stable")
+    positions = np.empty_like(order)
+    positions[rows, order] = teams
+    counts = np.bincount((teams * team_count + positions).ravel(), minlength=team_count * team_count)
+    return counts.reshape(team_count, team_count) / simulations
+
+# Tournaments to simulate for a field and the rounds left, between MIN_SIMULATIONS and SIMULATIONS
+def simulation_count(team_count, remaining):
+    return int(min(SIMULATIONS, max(MIN_SIMULATIONS, SIMULATION_BUDGET // max(team_count * remaining, 1))))
+
+# Standings for every round, precomputed once per teams_data as teams x rounds arrays.
+# Rankings sort by total VPs and opponents pair the highest match VPs with the lowest;
+# both use stable sorts so ties keep results-table order.
+class Standings:
+    def __init__(self, teams_data, round_count):
+        self.teams_data = teams_data
+        self.round_count = round_count
+        self.names = np.array([team["name"] for team in teams_data] + ["Unknown"], dtype=object)
+        
+        team_count = len(teams_data)
+        match_vps = np.zeros((team_count, round_count))
+        for i, team in enumerate(teams_data):
+            matches = team["matches"][:round_count]
+            match_vps[i, :len(matches)] = matches
+        penalties = np.array([team.get("penalty", 0) for team in teams_data], dtype=float)
+        total_vps = np.cumsum(match_vps, axis=1) + penalties[:, None]
+        
+        self.match_vps = match_vps
+        self.total_vps = total_vps
+        # Rounds up to the last one with any non-zero result, like scraper.completed_rounds
+        reported = np.flatnonzero(match_vps.any(axis=0))
+        self.completed_rounds = int(reported[-1]) + 1 if reported.size else 0
+        self.order = np.argsort(-total_vps, axis=0, kind="stable")
+        
+        # Opponent index per team and round; the index past the last team means "Unknown"
+        by_match_vps = np.argsort(-match_vps, axis=0, kind="stable")
+        rounds = np.arange(round_count)
+        self.opponents = np.empty_like(by_match_vps)
+        self.opponents[by_match_vps, rounds] = by_match_vps[::-1]
+        if team_count % 2:
+            self.opponents[by_match_vps[team_count // 2], rounds] = team_count
+        
+        self.match_vps_text = np.char.mod("%.2f", match_vps)
+        self.total_vps_text = np.char.mod("%.2f", total_vps)
+        self._projections = {}
+
+    # Rounds actually played as of round_index; later rounds only hold unreported zeros
+    def played_rounds(self, round_index):
+        return min(round_index + 1, self.completed_rounds)
+
+    # Final position probabilities after round_index, simulated once per number of played rounds
+    def projection(self, round_index):
+        played = self.played_rounds(round_index)
+        if played not in self._projections:
+            self._projections[played] = project_positions(
+                self.match_vps, self.total_vps[:, max(played - 1, 0)], played, self.round_count - played
+            )
+        return self._projections[played]
+
+    # Projection summary in ranking order: win and top-3 chances and the expected final position
+    def projection_frame(self, round_index):
+        order = self.order[:, round_index]
+        probabilities = self.projection(round_index)[order]
+        return pd.DataFrame({
+            "Position": np.arange(1, len(order) + 1),
+            "Team": self.names[order],
+            "Win": probabilities[:, 0] * 100,
+            "Top 3": probabilities[:, :3].sum(axis=1) * 100,
+            "Expected position": probabilities @ np.arange(1, len(order) + 1)
+        })
+
+    def ranking_frame(self, round_index):
+        order = self.order[:, round_index]
+        return pd.DataFrame({
+            "Position": np.arange(1, len(order) + 1),
+            "Team": self.names[order],
+            "Match VPs": self.match_vps_text[order, round_index],
+            "Total VPs": self.total_vps_text[order, round_index],
+            "Competitor": self.names[self.opponents[order, round_index]],
+            "": "View Games"
+        })
+
+# A loaded event shared by every session viewing it. Its teams data is read-only: result
+# updates publish a new LoadedEvent rather than changing this one. Game details can be loaded
+# lazily; loaded_teams names the teams whose games are in game_store (all teams by default)
+# and load_games() fetches the others on demand.
+class LoadedEvent:
+    def __init__(self, results_url, event_title, teams_data, game_store, loaded_at=None, loaded_teams=None, schema=None):
+        self.results_url = results_url
+        self.event_title = event_title
+        self.teams_data = teams_data
+        self.schema = schema or scraper.EventSchema.for_teams(teams_data)
+        self.team_names = tuple(team["name"] for team in teams_data)
+        self.team_index = {name: i for i, name in enumerate(self.team_names)}
+        self.game_store = game_store
+        self.loaded_at = loaded_at or time.time()
+        if loaded_teams is None:
+            loaded_teams = [team["name"] for team in teams_data]
+        self.loaded_teams = frozenset(loaded_teams)
+        self.nbytes = self._measure()
+        self._standings = None
+        self._pending = {}
+        self._fill_thread = None
+        self._lock = threading.Lock()
+
+    def _measure(self):
+        return int(self.game_store.frame.memory_usage(deep=True).sum()) + len(json.dumps(self.teams_data))
+
+    # Names of teams whose games are not loaded yet, optionally limited to names
+    def missing_teams(self, names=None):
+        return [
+            team["name"] for team in self.teams_data
+            if team["name"] not in self.loaded_teams and (names is None or team["name"] in names)
+        ]
+
+    # Make sure the games of the named teams are in game_store and return it. Teams that
+    # another caller is already fetching are waited for rather than fetched twice.
+    def load_games(self, names, diagnostics=None, max_workers=scraper.FETCH_WORKERS):
+        names = set(names)
+        with self._lock:
+            waiting = {self._pending[name] for name in names if name in self._pending}
+            teams = [
+                team for team in self.teams_data
+                if team["name"] in names and team["name"] not in self.loaded_teams and team["name"] not in self._pending
+            ]
+            inflight = Future()
+            for team in teams:
+                self._pending[team["name"]] = inflight
+        
+        if teams:
+            try:
+                games = [game for _, team_games in scraper.iter_match_details(teams, self.results_url, diagnostics, max_workers) for game in team_games]
+                fetched = [team["name"] for team in teams]
+                with self._lock:
+                    self.game_store = self.game_store.replace_teams(fetched, games, [team["name"] for team in self.teams_data])
+                    self.loaded_teams = self.loaded_teams | set(fetched)
+                    self.nbytes = self._measure()
+                inflight.set_result(None)
+            except Exception as e:
+                inflight.set_exception(e)
+                raise
+            except BaseException:
+                inflight.cancel()
+                raise
+            finally:
+                with self._lock:
+                    for team in teams:
+                        del self._pending[team["name"]]
+        
+        for future in waiting:
+            try:
+                future.result()
+            except CancelledError:
+                return self.load_games(names, diagnostics, max_workers)
+        return self.game_store
+
+    # Load the named teams' games on a background thread
+    def prefetch(self, names, diagnostics=None):
+        with self._lock:
+            names = [name for name in self.missing_teams(names) if name not in self._pending]
+        if names:
+            threading.Thread(target=self.load_games, args=(names, diagnostics), name=f"Prefetch {self.results_url}", daemon=True).start()
+
+    # Low-priority fill of every team not loaded yet: one page at a time, so on-demand loads
+    # keep most of the per-host fetch slots, merged into the game store in small batches
+    def fill_in_background(self):
+        with self._lock:
+            if self._fill_thread is not None and self._fill_thread.is_alive():
+                return
+            self._fill_thread = threading.Thread(target=self._fill, name=f"Fill {self.results_url}", daemon=True)
+            self._fill_thread.start()
+
+    def _fill(self):
+        while True:
+            with self._lock:
+                missing = [name for name in self.missing_teams() if name not in self._pending]
+            if not missing:
+                return
+            self.load_games(missing[:FILL_BATCH], max_workers=1)
+
+    def standings(self, round_count):
+        with self._lock:
+            if self._standings is None or self._standings.round_count != round_count:
+                self._standings = Standings(self.teams_data, round_count)
+            return self._standings
+
+# Process-wide store of loaded events keyed by results URL. Entries expire after ttl seconds
+# and the least recently used ones are evicted to stay under memory_budget. Concurrent loads
+# of the same URL are coalesced: one caller runs the loader and the others wait for its result.
+class EventStore:
+    def __init__(self, ttl=EVENT_TTL, memory_budget=EVENT_MEMORY_BUDGET):
+        self.ttl = ttl
+        self.memory_budget = memory_budget
+        self._events = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _get(self, results_url):
+        event = self._events.get(results_url)
+        if event is None:
+            return None
+        if time.time() - event.loaded_at > self.ttl:
+            del self._events[results_url]
+            return None
+        self._events.move_to_end(results_url)
+        return event
+
+    def get(self, results_url):
+        with self._lock:
+            return self._get(results_url)
+
+    def put(self, event):
+        with self._lock:
+            self._events[event.results_url] = event
+            self._events.move_to_end(event.results_url)
+            total = sum(item.nbytes for item in self._events.values())
+            while total > self.memory_budget and len(self._events) > 1:
+                _, evicted = self._events.popitem(last=False)
+                total -= evicted.nbytes
+
+    def invalidate(self, results_url):
+        with self._lock:
+            self._events.pop(results_url, None)
+
+    # Return the stored event or load it. loader() returns a LoadedEvent or None on failure;
+    # failures are not stored, so the next call retries.
+    def get_or_load(self, results_url, loader):
+        with self._lock:
+            event = self._get(results_url)
+            if event is not None:
+                return event
+            inflight = self._inflight.get(results_url)
+            owner = inflight is None
+            if owner:
+                inflight = self._inflight[results_url] = Future()
+        
+        if not owner:
+            try:
+                return inflight.result()
+            except CancelledError:
+                return self.get_or_load(results_url, loader)
+        try:
+            event = loader()
+            if event is not None:
+                self.put(event)
+            inflight.set_result(event)
+            return event
+        except Exception as e:
+            inflight.set_exception(e)
+            raise
+        except BaseException:
+            # The loading script was stopped or rerun; a waiting caller takes over the load
+            inflight.cancel()
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[results_url]
+
+    def stats(self):
+        with self._lock:
+            return len(self._events), sum(event.nbytes for event in self._events.values())
+
+@st.cache_resource
+def get_event_store():
+    return EventStore()
 
 def app():
     # Set page config to wide layout
@@ -21,8 +449,8 @@ def app():
         st.session_state.current_round_index = -1
     if 'event_title' not in st.session_state:
         st.session_state.event_title = "Bridge Competition Rankings"
-    if 'all_games_data' not in st.session_state:
-        st.session_state.all_games_data = []
+    if 'game_store' not in st.session_state:
+        st.session_state.game_store = GameStore.from_records([])
     if 'scraping_progress' not in st.session_state:
         st.session_state.scraping_progress = 0
     if 'cache_timestamp' not in st.session_state:
@@ -41,6 +469,27 @@ def app():
         st.session_state.viewed_match_VPs = None
     if 'viewing_games' not in st.session_state:
         st.session_state.viewing_games = False
+    if 'live_follow' not in st.session_state:
+        st.session_state.live_follow = False
+    if 'live_version' not in st.session_state:
+        st.session_state.live_version = None  # (results_url, poller version) last applied
+    if 'table_mode' not in st.session_state:
+        st.session_state.table_mode = "Buttons"
+    if 'ranking_table_nonce' not in st.session_state:
+        st.session_state.ranking_table_nonce = 0
+    if 'event' not in st.session_state:
+        st.session_state.event = None
+    if 'lazy_games' not in st.session_state:
+        st.session_state.lazy_games = True
+    if 'background_fill' not in st.session_state:
+        st.session_state.background_fill = True
+    if 'snapshot_saved_at' not in st.session_state:
+        st.session_state.snapshot_saved_at = None
+    if 'show_projection' not in st.session_state:
+        st.session_state.show_projection = False
+    if 'diagnostics' not in st.session_state:
+        st.session_state.diagnostics = scraper.Diagnostics()
+    diagnostics = st.session_state.diagnostics
 
     # Set up CSS
     st.markdown("""
@@ -86,177 +535,167 @@ def app():
     </style>
     """, unsafe_allow_html=True)
 
-    # Scrape team data
-    def scrape_team_data(url):
+    # Scrape team data and the event's schema; returns (teams_data, schema), teams_data None on failure
+    def scrape_event(url):
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers)
-            response.encoding = 'utf-8'
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            event_info = soup.find('table', {'class': 'eventInfo'})
-            if event_info:
-                title_row = event_info.find('tr', {'class': 'eventInfoTitle'})
-                if title_row:
-                    st.session_state.event_title = title_row.find('td').text.strip()
-            
-            table = soup.find('table', {'class': 'resultsTable'})
-            
-            if not table:
-                st.error("Could not find results table in the page")
-                return None
-                
-            teams_data = []
-            
-            for row in table.find_all('tr')[1:]:
-                cols = row.find_all('td')
-                if len(cols) < 5:
-                    continue
-                
-                name_link = cols[1].find('a')
-                name = name_link.text.strip() if name_link else cols[1].text.strip()
-                personal_url = name_link['href'] if name_link and name_link.has_attr('href') else None
-                
-                matches = []
-                for col in cols[4:32]:
-                    bdo = col.find('bdo')
-                    if bdo:
-                        match_score_text = bdo.text.strip().replace(',', '.')
-                        try:
-                            matches.append(float(match_score_text))
-                        except ValueError:
-                            matches.append(0.0)
-                    else:
-                        matches.append(0.0)
-                
-                penalty_col = cols[-1].find('bdo')
-                penalty = 0.0
-                if penalty_col:
-                    penalty_text = penalty_col.text.strip().replace(',', '.').replace(' ', '')
-                    if penalty_text and penalty_text != '.':
-                        try:
-                            penalty = float(penalty_text)
-                        except ValueError:
-                            penalty = 0.0
-                
-                teams_data.append({
-                    "name": name,
-                    "matches": matches,
-                    "penalty": penalty,
-                    "personal_url": personal_url
-                })
-            
-            return teams_data if teams_data else None
-            
+            event_title, teams_data, schema = scraper.scrape_event(url, diagnostics)
+        except scraper.ScrapeError as e:
+            st.error(str(e))
+            return None, None
         except Exception as e:
             st.error(f"Error scraping data: {str(e)}")
-            return None
+            return None, None
+        if event_title is not None:
+            st.session_state.event_title = event_title
+        return teams_data, schema
 
-    # Get match details
-    def get_all_match_details(team_name, personal_url):
-        if not personal_url:
-            return []
+    # Fetch all personal pages concurrently, parsing each as it arrives
+    def load_all_match_details(teams, results_url=None, on_progress=None):
+        return scraper.load_all_match_details(teams, results_url, on_progress, diagnostics)
+
+    # Point the session at a shared event; the session keeps references, not copies.
+    # snapshot_saved_at is set when the event was opened from a snapshot file.
+    def use_event(event, snapshot_saved_at=None):
+        st.session_state.event = event
+        st.session_state.snapshot_saved_at = snapshot_saved_at
+        st.session_state.results_url = event.results_url
+        st.session_state.event_title = event.event_title
+        st.session_state.teams_data = event.teams_data
+        st.session_state.game_store = event.game_store
+        st.session_state.cache_timestamp = event.loaded_at
+
+    # Make sure the named teams' games are loaded into the session's event, fetching them if needed
+    def load_games(names):
+        event = st.session_state.event
+        if event is None:
+            return
+        if event.missing_teams(names):
+            with st.spinner("Loading game details..."), diagnostics.timer("load games"):
+                event.load_games(names, diagnostics)
+        st.session_state.game_store = event.game_store
+    
+    # Open an event from the local archive instead of scraping it
+    def open_archived_event(url):
+        archived = archive.get_archive().load_event(url)
+        if archived is None:
+            return False
+        event_title, teams_data, games, archived_at, schema = archived
+        schema = scraper.EventSchema.from_dict(schema) if schema else None
+        use_event(LoadedEvent(url, event_title, teams_data, GameStore.from_records(games), loaded_at=archived_at, schema=schema))
+        return True
+    
+    # Open a snapshot file; the event is not shared with other sessions
+    def open_snapshot(source):
+        try:
+            snapshot = snapshots.load_snapshot(source)
+        except snapshots.SnapshotError as e:
+            st.error(str(e))
+            return False
+        game_store = GameStore(GameStore._compact(snapshot.games))
+        schema = scraper.EventSchema.from_dict(snapshot.schema) if snapshot.schema else None
+        event = LoadedEvent(snapshot.results_url, snapshot.event_title, snapshot.teams_data, game_store,
+                            loaded_at=snapshot.cache_timestamp, schema=schema)
+        use_event(event, snapshot.saved_at)
+        st.session_state.live_follow = False
+        return True
+    
+    # Snapshot of the session's event, built once per game store. Background fill updates the
+    # event's game store without touching the session's, so sync them first as archiving does.
+    def snapshot_data():
+        event = st.session_state.event
+        if event is not None:
+            load_games(event.missing_teams())
+        cached = st.session_state.get('snapshot')
+        if cached is None or cached[0] is not st.session_state.game_store:
+            data = snapshots.snapshot_bytes(
+                st.session_state.results_url,
+                st.session_state.event_title,
+                st.session_state.teams_data,
+                st.session_state.game_store.frame,
+                st.session_state.cache_timestamp,
+                event.schema.to_dict() if event is not None else None
+            )
+            st.session_state.snapshot = (st.session_state.game_store, data)
+        return st.session_state.snapshot[1]
+    
+    # Archive the session's event, loading any game details that are still missing
+    def save_to_archive():
+        event = st.session_state.event
+        load_games(event.missing_teams())
+        archive.get_archive().save_event(event.results_url, event.event_title, event.teams_data, st.session_state.game_store.records(),
+                                         schema=event.schema.to_dict())
+    
+    # Merge new results into the session, re-fetching personal pages only for changed teams.
+    # prefetched maps team names to games that were already fetched, e.g. by the live poller.
+    # Teams whose games were never loaded stay unloaded until they are viewed. schema is the
+    # schema scraped with new_teams; without one the current event's is kept if it still fits.
+    # If another session already published these results, the shared event is adopted as is.
+    def apply_team_updates(new_teams, prefetched=None, schema=None):
+        prefetched = prefetched or {}
+        event_store = get_event_store()
+        changed = scraper.changed_teams(st.session_state.teams_data, new_teams)
         
-        if 'debug_log' not in st.session_state:
-            st.session_state.debug_log = []
+        shared = event_store.get(st.session_state.results_url)
+        if shared is not None and not scraper.changed_teams(shared.teams_data, new_teams):
+            use_event(shared)
+            return len(changed)
         
-        try:
-            if personal_url.startswith('personal1.php'):
-                full_url = f"https://www.bridge.co.il/viewer/{personal_url}"
-            else:
-                full_url = personal_url
-            
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(full_url, headers=headers)
-            response.encoding = 'utf-8'
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            all_games = []
-            match_tables = soup.find_all('table', {'class': 'mpersonal'})
-            st.session_state.debug_log.append(f"Team {team_name}: Found {len(match_tables)} match tables")
+        event = st.session_state.event
+        unloaded = set(event.missing_teams()) if event is not None else set()
+        game_store = event.game_store if event is not None else st.session_state.game_store
+        
+        games = [game for team in changed if team["name"] in prefetched for game in prefetched[team["name"]]]
+        missing = [team for team in changed if team["name"] not in prefetched and team["name"] not in unloaded]
+        games.extend(load_all_match_details(missing, st.session_state.results_url))
+        
+        changed_names = {team["name"] for team in changed}
+        game_store = game_store.replace_teams(
+            list(changed_names),
+            games,
+            [team["name"] for team in new_teams]
+        )
+        # The poller keeps every team it ever fetched; an unloaded team only becomes loaded
+        # when its prefetched games were merged above
+        loaded_teams = [team["name"] for team in new_teams
+                        if team["name"] not in unloaded or (team["name"] in prefetched and team["name"] in changed_names)]
+        if schema is None and event is not None and event.schema.round_count == scraper.EventSchema.for_teams(new_teams).round_count:
+            schema = event.schema
+        event = LoadedEvent(st.session_state.results_url, st.session_state.event_title, new_teams, game_store,
+                            loaded_teams=loaded_teams, schema=schema)
+        event_store.put(event)
+        use_event(event)
+        return len(changed)
+
+    # Re-scrape the results table and re-fetch personal pages only for teams whose results changed
+    def refresh_changed_teams():
+        new_teams, schema = scrape_event(st.session_state.results_url)
+        if not new_teams:
+            return None
+        return apply_team_updates(new_teams, schema=schema)
+
+    # Diagnostics panel: phase timings, downloads and recent parse events
+    def display_diagnostics():
+        with st.expander("Diagnostics"):
+            levels = {0: "Off", 1: "Teams and matches", 2: "Every row"}
+            diagnostics.level = st.selectbox("Parse event level:", list(levels), index=diagnostics.level, format_func=levels.get, key="diagnostics_level")
             
-            for table in match_tables:
-                match_link = table.find('a', href=lambda x: x and 'round=' in x)
-                if not match_link:
-                    st.session_state.debug_log.append(f"Team {team_name}: No match link in table")
-                    continue
-                
-                try:
-                    match_number = int(match_link['href'].split('round=')[1].split('&')[0])
-                except:
-                    st.session_state.debug_log.append(f"Team {team_name}: Failed to extract match number")
-                    continue
-                
-                st.session_state.debug_log.append(f"Team {team_name}: Processing match {match_number}")
-                
-                rows = table.find_all('tr')
-                start_index = 4
-                game_rows = rows[start_index:]
-                st.session_state.debug_log.append(f"Team {team_name}, Match {match_number}: Found {len(game_rows)} game rows")
-                
-                for row in game_rows:
-                    cols = row.find_all('td')
-                    if len(cols) < 6:
-                        st.session_state.debug_log.append(f"Team {team_name}, Match {match_number}: Skipped row - {len(cols)} cols")
-                        continue
-                    
-                    board = ""
-                    for col in cols:
-                        if 'rank' in col.get('class', []):
-                            board_link = col.find('a')
-                            board = board_link.text.strip() if board_link and any(c.isdigit() for c in board_link.text.strip()) else ""
-                            break
-                    if not board:
-                        st.session_state.debug_log.append(f"Team {team_name}, Match {match_number}: Skipped row - no board")
-                        continue
-                    
-                    contract = ""
-                    for col in cols:
-                        if 'contract' in col.get('class', []):
-                            contract = col.get_text(strip=True)
-                            break
-                    
-                    if not contract or 'NP' in contract.upper():
-                        st.session_state.debug_log.append(f"Team {team_name}, Match {match_number}: Skipped row - no contract: '{contract}'")
-                        continue
-                    
-                    lead = ""
-                    for col in cols:
-                        if 'lead' in col.get('class', []):
-                            lead = col.find('bdo').get_text(strip=True) if col.find('bdo') else col.get_text(strip=True)
-                            break
-                    if not lead and len(cols) >= 3:
-                        lead = cols[-3].get_text(strip=True)
-                    
-                    imp = ""
-                    for col in cols:
-                        if 'res' in col.get('class', []) and 'resns' not in col.get('class', []) and 'resew' not in col.get('class', []):
-                            imp = col.get_text(strip=True)
-                            break
-                    
-                    ns_score = cols[0].get_text(strip=True) if cols[0].get_text(strip=True) else ""
-                    ew_score = cols[1].get_text(strip=True) if cols[1].get_text(strip=True) else ""
-                    score = ns_score if ns_score else ew_score if ew_score else ""
-                    
-                    game_data = {
-                        "team": team_name,
-                        "match": match_number,
-                        "board": board,
-                        "contract": contract,
-                        "score": score,
-                        "imp": imp,
-                        "lead": lead
-                    }
-                    all_games.append(game_data)
-                    st.session_state.debug_log.append(f"Team {team_name}, Match {match_number}, Board {board}: Added game - contract={contract}, imp={imp}, lead={lead}, score={score}")
+            # Background fetches keep recording into diagnostics, so read a copy
+            phases, downloads, events = diagnostics.snapshot()
+            if phases:
+                phases_df = pd.DataFrame.from_dict(phases, orient="index")
+                phases_df.columns = ["Count", "Total (s)", "Last (s)", "Max (s)"]
+                st.dataframe(phases_df, use_container_width=True)
+            if downloads:
+                downloads_df = pd.DataFrame.from_dict(downloads, orient="index")
+                downloads_df.columns = ["Bytes", "Status", "Seconds"]
+                st.caption(f"Downloaded {downloads_df['Bytes'].sum():,} bytes from {len(downloads_df)} URLs")
+                st.dataframe(downloads_df.sort_values("Bytes", ascending=False), use_container_width=True)
+            if events:
+                st.text("\n".join(message for _, message in events[-50:]))
             
-            st.session_state.debug_log.append(f"Team {team_name}: Total games collected: {len(all_games)}")
-            return all_games
-        except Exception as e:
-            st.session_state.debug_log.append(f"Team {team_name}: Error - {str(e)}")
-            return []
+            event_count, event_bytes = get_event_store().stats()
+            st.caption(f"Shared event store: {event_count} event(s), {event_bytes / 2 ** 20:.1f} MB")
+            st.download_button("Export JSON", diagnostics.to_json(), file_name="bridgefollow-diagnostics.json", mime="application/json")
 
     # Conditional UI rendering
     if not st.session_state.data_loaded:
@@ -264,6 +703,10 @@ def app():
         st.markdown(f"<h1 class='main-title'>Bridge Competition Rankings</h1>", unsafe_allow_html=True)
         default_url = "https://www.bridge.co.il/viewer/total1.php?event=26699"
         url_input = st.text_input("Enter results URL:", value=default_url)
+        st.session_state.lazy_games = st.checkbox("Load game details on demand", value=st.session_state.lazy_games,
+                                                  help="Show rankings as soon as the results page is read and fetch each team's games when they are viewed")
+        st.session_state.background_fill = st.checkbox("Fetch remaining game details in the background", value=st.session_state.background_fill,
+                                                       disabled=not st.session_state.lazy_games)
         
         col_load, col_refresh = st.columns([1, 1])
         with col_load:
@@ -274,32 +717,70 @@ def app():
         # Cache handling and data loading
         if load_button:
             with st.spinner("Loading team data..."):
-                scraped_data = scrape_team_data(url_input)
-                if scraped_data:
-                    st.session_state.teams_data = scraped_data
-                    st.session_state.results_url = url_input
-                    st.session_state.data_loaded = True
-                    st.session_state.all_games_data = []
-                    st.session_state.scraping_progress = 0
+                diagnostics.reset()
+                load_start = time.perf_counter()
+                
+                # Runs only in the session that starts the load; others wait for its result
+                def load_event():
+                    teams_data, schema = scrape_event(url_input)
+                    if not teams_data:
+                        return None
+                    if st.session_state.lazy_games:
+                        return LoadedEvent(url_input, st.session_state.event_title, teams_data, GameStore.from_records([]), loaded_teams=[], schema=schema)
                     
+                    st.session_state.scraping_progress = 0
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
-                    total_teams = len(st.session_state.teams_data)
-                    for i, team in enumerate(st.session_state.teams_data):
-                        status_text.text(f"Loading match details for {team['name']} ({i+1}/{total_teams})")
-                        games = get_all_match_details(team['name'], team['personal_url'])
-                        st.session_state.all_games_data.extend(games)
-                        st.session_state.scraping_progress = (i + 1) / total_teams
+                    def update_progress(team_name, done, total_teams):
+                        status_text.text(f"Loaded match details for {team_name} ({done}/{total_teams})")
+                        st.session_state.scraping_progress = done / total_teams
                         progress_bar.progress(st.session_state.scraping_progress)
                     
+                    games = load_all_match_details(teams_data, url_input, update_progress)
                     progress_bar.empty()
                     status_text.empty()
-                    st.session_state.cache_timestamp = time.time()
+                    return LoadedEvent(url_input, st.session_state.event_title, teams_data, GameStore.from_records(games), schema=schema)
+                
+                event = get_event_store().get_or_load(url_input, load_event)
+                if event is not None:
+                    use_event(event)
+                    if not st.session_state.lazy_games:
+                        load_games(event.missing_teams())  # another session loaded it on demand
+                    st.session_state.data_loaded = True
+                    diagnostics.add_time("load", time.perf_counter() - load_start)
                     st.markdown("<p class='success-message'>Data loaded successfully!</p>", unsafe_allow_html=True)
                     st.rerun()  # Rerun to switch to main GUI
                 else:
                     st.markdown("<p class='error-message'>Failed to load data. Please check the URL.</p>", unsafe_allow_html=True)
+        
+        # Archived events open without scraping
+        archived_events = archive.get_archive().events()
+        if archived_events:
+            with st.expander("Open archived event"):
+                archived = st.selectbox(
+                    "Archived event:",
+                    archived_events,
+                    format_func=lambda event: f"{event['title']} ({time.strftime('%Y-%m-%d %H:%M', time.localtime(event['archived_at']))}, {event['teams']} teams)"
+                )
+                if st.button("Open Archived"):
+                    with diagnostics.timer("open archived"):
+                        opened = open_archived_event(archived["url"])
+                    if opened:
+                        st.session_state.data_loaded = True
+                        st.rerun()
+                    st.markdown("<p class='error-message'>The archived event could not be opened.</p>", unsafe_allow_html=True)
+        
+        # Snapshots open offline, without scraping
+        if snapshots.SNAPSHOTS_AVAILABLE:
+            with st.expander("Open snapshot"):
+                uploaded = st.file_uploader("Snapshot file:", type=[snapshots.SNAPSHOT_EXTENSION.lstrip(".")])
+                if st.button("Open Snapshot", disabled=uploaded is None):
+                    with diagnostics.timer("open snapshot"):
+                        opened = open_snapshot(uploaded)
+                    if opened:
+                        st.session_state.data_loaded = True
+                        st.rerun()
     else:
         # Main GUI: Competition interface
         # Display event title
@@ -311,12 +792,23 @@ def app():
         
         # Main UI
         if st.session_state.teams_data:
-            matches_per_day = 7
-            rounds = []
-            for day in range(1, 5):
-                for match in range(1, matches_per_day + 1):
-                    start_match = (day - 1) * matches_per_day + match
-                    rounds.append(f"Day {day} - Match {start_match}")
+            # Round labels come from the event's schema, built once when the event was loaded
+            event = st.session_state.event
+            if event is None or event.teams_data is not st.session_state.teams_data:
+                event = LoadedEvent(st.session_state.results_url, st.session_state.event_title, st.session_state.teams_data, st.session_state.game_store)
+                st.session_state.event = event
+            rounds = event.schema.round_labels
+            
+            # Standings are rebuilt only when teams_data is replaced
+            def get_standings():
+                event = st.session_state.event
+                if event is not None and event.teams_data is st.session_state.teams_data:
+                    return event.standings(len(rounds))
+                standings = st.session_state.get('standings')
+                if standings is None or standings.teams_data is not st.session_state.teams_data or standings.round_count != len(rounds):
+                    standings = Standings(st.session_state.teams_data, len(rounds))
+                    st.session_state.standings = standings
+                return standings
             
             # Calculate rankings
             def calculate_rankings(round_index):
@@ -324,57 +816,67 @@ def app():
                     return None, -1
                 
                 current_match = min(round_index, len(rounds) - 1)
+                return get_standings().ranking_frame(current_match), current_match
+            
+            # Switch to the games view for a ranking row
+            def open_games_view(row, current_match):
+                st.session_state.viewed_team = row["Team"]
+                st.session_state.viewed_competitor = row["Competitor"]
+                st.session_state.viewed_match = current_match
+                st.session_state.viewed_match_VPs = row["Match VPs"]
+                st.session_state.viewing_games = True
+                st.session_state.ranking_table_nonce += 1  # drop the table's row selection
+                st.rerun()
+            
+            # Compact layout: one dataframe widget, a row selection opens the games view
+            def display_ranking_table(df, current_match):
+                selected = st.session_state.selected_team
+                styled = df.drop(columns=[""]).style.map(
+                    lambda team: 'background-color: yellow' if team == selected else '',
+                    subset=["Team"]
+                )
+                event = st.dataframe(
+                    styled,
+                    hide_index=True,
+                    use_container_width=True,
+                    on_select="rerun",
+                    selection_mode="single-row",
+                    key=f"ranking_table_{current_match}_{st.session_state.ranking_table_nonce}"
+                )
+                st.caption("Select a row to view its games")
+                if event.selection.rows:
+                    open_games_view(df.iloc[event.selection.rows[0]], current_match)
+            
+            # Final position chances after current_match, simulated once per round and shared by sessions
+            def display_projection(current_match):
+                remaining = len(rounds) - get_standings().played_rounds(current_match)
+                with diagnostics.timer("projection"):
+                    projection_df = get_standings().projection_frame(current_match)
+                    probabilities = get_standings().projection(current_match)
                 
-                match_vps = []
-                for team in st.session_state.teams_data:
-                    match_vps.append({
-                        "name": team["name"],
-                        "vp": team["matches"][current_match] if current_match < len(team["matches"]) else 0
-                    })
-                
-                match_vps_sorted = sorted(match_vps, key=lambda x: x["vp"], reverse=True)
-                paired_teams = []
-                temp_match_vps = match_vps_sorted.copy()
-                
-                while temp_match_vps:
-                    if len(temp_match_vps) == 1:
-                        paired_teams.append([temp_match_vps[0], {"name": "Unknown", "vp": 0}])
-                        break
-                    highest = temp_match_vps.pop(0)
-                    lowest = temp_match_vps.pop(-1)
-                    paired_teams.append([highest, lowest])
-                
-                teams_display = []
-                for team in st.session_state.teams_data:
-                    total_vps = sum(team["matches"][:current_match+1]) + team.get("penalty", 0)
-                    
-                    competitor = "Unknown"
-                    for pair in paired_teams:
-                        if pair[0]["name"] == team["name"]:
-                            competitor = pair[1]["name"]
-                            break
-                        elif pair[1]["name"] == team["name"]:
-                            competitor = pair[0]["name"]
-                            break
-                    
-                    teams_display.append({
-                        "name": team["name"],
-                        "matchVPs": team["matches"][current_match] if current_match < len(team["matches"]) else 0,
-                        "totalVPs": total_vps,
-                        "competitor": competitor
-                    })
-                
-                teams_display.sort(key=lambda x: x["totalVPs"], reverse=True)
-                
-                df = pd.DataFrame(teams_display)
-                df.insert(0, "Position", range(1, len(df) + 1))
-                df["View Games"] = "View Games"
-                df.columns = ["Position", "Team", "Match VPs", "Total VPs", "Competitor", ""]
-                
-                df["Match VPs"] = df["Match VPs"].map(lambda x: f"{x:.2f}")
-                df["Total VPs"] = df["Total VPs"].map(lambda x: f"{x:.2f}")
-                
-                return df, current_match
+                st.markdown("<h3>Projected final standings</h3>", unsafe_allow_html=True)
+                simulations = simulation_count(len(st.session_state.teams_data), remaining)
+                st.caption(f"{simulations:,} simulated tournaments over the {remaining} remaining rounds")
+                selected = st.session_state.selected_team
+                percent = {"min_value": 0, "max_value": 100, "format": "%.1f%%"}
+                st.dataframe(
+                    projection_df.style.map(lambda team: 'background-color: yellow' if team == selected else '', subset=["Team"]),
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        "Win": st.column_config.ProgressColumn("Win", **percent),
+                        "Top 3": st.column_config.ProgressColumn("Top 3", **percent),
+                        "Expected position": st.column_config.NumberColumn(format="%.1f")
+                    }
+                )
+                with st.expander("Position probabilities"):
+                    order = get_standings().order[:, current_match]
+                    matrix_df = pd.DataFrame(
+                        probabilities[order] * 100,
+                        index=get_standings().names[order],
+                        columns=[str(position) for position in range(1, len(order) + 1)]
+                    )
+                    st.dataframe(matrix_df.round(1), use_container_width=True)
             
             # Handle View Games click
             def display_games_table(team, match, competitor, match_vps):
@@ -382,19 +884,124 @@ def app():
                     st.session_state.viewing_games = False
                     st.rerun()
                 
-                games = [g for g in st.session_state.all_games_data if g["team"] == team and g["match"] == match + 1]
-                if games:
+                load_games([team])
+                if st.session_state.event is not None:
+                    st.session_state.event.prefetch([competitor], diagnostics)
+                games = st.session_state.game_store.games_for(team, match + 1)
+                if len(games):
                     st.markdown(f"<h3>Games for Match {match + 1}</h3><h4>{team} ({round(float(match_vps),2)} VP) - VS - {competitor} ({round(20-float(match_vps),2)} VP)</h4>", unsafe_allow_html=True)
-                    games_df = pd.DataFrame(games)[["board", "contract", "score", "imp", "lead"]]
-                    games_df.columns = ["Board", "Contract", "Score", "IMP", "Lead"]
+                    games_df = games[["board", "contract", "score", "imp", "lead"]]
+                    games_df.columns = ["Board", "Contract", "NS Score", "IMP", "Lead"]
                     st.dataframe(
                         games_df,
                         hide_index=True,
-                        use_container_width=True
+                        use_container_width=True,
+                        column_config={
+                            "NS Score": st.column_config.NumberColumn(format="%g"),
+                            "IMP": st.column_config.NumberColumn(format="%g")
+                        }
                     )
+                    
+                    board = st.selectbox("Compare a board across the field:", ["Select a board"] + list(games_df["Board"]), key=f"compare_board_{team}_{match}")
+                    if board != "Select a board":
+                        display_board_comparison(team, match, board)
                 else:
                     st.markdown(f"<p>No games found for {team} in Match {match + 1}</p>", unsafe_allow_html=True)
             
+            # Every table's result on one board, with the field's contract, lead and score distributions
+            def display_board_comparison(team, match, board):
+                event = st.session_state.event
+                if event is not None and event.missing_teams():
+                    load_games(event.missing_teams())
+                game_store = st.session_state.game_store
+                summary = game_store.board_summary()
+                spread = summary.spread(match + 1, board)
+                if spread is None:
+                    st.markdown(f"<p>No results found for Board {board} in Match {match + 1}</p>", unsafe_allow_html=True)
+                    return
+                
+                st.markdown(f"<h4>Board {board}, Match {match + 1}: {spread['tables']} tables</h4>", unsafe_allow_html=True)
+                stat_cols = st.columns(4)
+                stat_cols[0].metric("Median NS score", f"{spread['score_median']:g}")
+                stat_cols[1].metric("NS score range", f"{spread['score_min']:g} to {spread['score_max']:g}")
+                stat_cols[2].metric("NS score std dev", f"{spread['score_std']:.0f}" if pd.notna(spread['score_std']) else "-")
+                stat_cols[3].metric("IMP range", f"{spread['imp_min']:g} to {spread['imp_max']:g}")
+                
+                share = st.column_config.ProgressColumn("Share", format="%.0f%%", min_value=0, max_value=100)
+                col_contracts, col_leads = st.columns(2)
+                with col_contracts:
+                    contracts = summary.contract_frequencies(match + 1, board)
+                    contracts["Share"] *= 100
+                    st.dataframe(contracts, hide_index=True, use_container_width=True, column_config={"Share": share})
+                with col_leads:
+                    leads = summary.lead_frequencies(match + 1, board)
+                    leads["Share"] *= 100
+                    st.dataframe(leads, hide_index=True, use_container_width=True, column_config={"Share": share})
+                
+                results = game_store.board_results(match + 1, board)[["team", "contract", "lead", "score", "imp"]]
+                results.columns = ["Team", "Contract", "Lead", "NS Score", "IMP"]
+                st.dataframe(
+                    results.sort_values("NS Score", ascending=False, kind="stable").style.map(
+                        lambda name: 'background-color: yellow' if name == team else '',
+                        subset=["Team"]
+                    ),
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        "NS Score": st.column_config.NumberColumn(format="%g"),
+                        "IMP": st.column_config.NumberColumn(format="%g")
+                    }
+                )
+            
+            # Fetch the followed team's games and those of every opponent it has played so far
+            def prefetch_followed_team(team):
+                event = st.session_state.event
+                if event is None or not event.missing_teams():
+                    return
+                standings = get_standings()
+                index = event.team_index[team]
+                played = standings.completed_rounds
+                event.prefetch([team] + list(standings.names[standings.opponents[index, :played]]), diagnostics)
+            
+            # Followed team's final standings across archived events
+            def display_team_history(team):
+                with st.expander(f"{team} in archived events"):
+                    trend = archive.get_archive().team_vp_trend(team)
+                    if not trend:
+                        st.caption("No archived events for this team yet")
+                        return
+                    trend_df = pd.DataFrame(trend)
+                    trend_df["archived_at"] = pd.to_datetime(trend_df["archived_at"], unit="s")
+                    st.line_chart(trend_df, x="archived_at", y="total_vps", x_label="Archived", y_label="Total VPs")
+                    trend_df = trend_df[["title", "archived_at", "total_vps", "position", "field", "rounds"]]
+                    trend_df.columns = ["Event", "Archived", "Total VPs", "Position", "Teams", "Rounds"]
+                    st.dataframe(trend_df, hide_index=True, use_container_width=True)
+            
+            # Live follow: reads the shared poller every few seconds and reruns the app only when
+            # it has published new results. Polling itself happens on the poller's thread.
+            @st.fragment(run_every=LIVE_CHECK_SECONDS)
+            def live_follow_status():
+                poller = get_event_poller(st.session_state.results_url)
+                poller.touch()
+                live_version = (st.session_state.results_url, poller.version)
+                if live_version != st.session_state.live_version and poller.teams_data:
+                    st.session_state.live_version = live_version
+                    changed_count = apply_team_updates(poller.teams_data, poller.team_games(), poller.schema)
+                    latest_round = min(poller.completed_rounds, len(rounds)) - 1
+                    advanced = latest_round > st.session_state.current_round_index
+                    if advanced:
+                        st.session_state.current_round_index = latest_round
+                        st.session_state.show_round = True
+                    if changed_count or advanced:
+                        st.rerun()
+                
+                if poller.last_poll is None:
+                    st.caption("Live follow: waiting for the first check...")
+                else:
+                    status = f"error: {poller.last_error}" if poller.last_error else f"{poller.completed_rounds} rounds completed"
+                    st.caption(f"Live follow: checked at {time.strftime('%H:%M:%S', time.localtime(poller.last_poll))}, "
+                               f"next check in {poller.interval:.0f}s, {status}")
+            
             # Display either games view or matches view
             if st.session_state.viewing_games and st.session_state.viewed_team is not None and st.session_state.viewed_match is not None:
                 display_games_table(st.session_state.viewed_team, st.session_state.viewed_match, st.session_state.viewed_competitor, st.session_state.viewed_match_VPs)
@@ -403,12 +1010,21 @@ def app():
                 col1, col2 = st.columns([2, 1])
                 
                 with col1:
-                    team_options = ["Select a team to follow"] + [team["name"] for team in st.session_state.teams_data]
+                    team_options = ("Select a team to follow",) + st.session_state.event.team_names
+                    if st.session_state.selected_team not in team_options:
+                        st.session_state.selected_team = "Select a team to follow"
                     selected_team = st.selectbox("Team to follow:", team_options, index=team_options.index(st.session_state.selected_team), key="team_select_unique")
                     st.session_state.selected_team = selected_team
+                    if selected_team != "Select a team to follow":
+                        prefetch_followed_team(selected_team)
+                        display_team_history(selected_team)
+                    st.toggle("Live follow", key="live_follow")
+                    if st.session_state.live_follow:
+                        live_follow_status()
                 
                 with col2:
-                    st.markdown("<br/>", unsafe_allow_html=True)
+                    st.radio("Table layout:", ["Buttons", "Compact"], horizontal=True, key="table_mode")
+                    st.session_state.show_projection = st.toggle("Projected final standings", value=st.session_state.show_projection)
                     if st.button("Next Match", disabled=st.session_state.current_round_index >= len(rounds) - 1, key="next_match_button"):
                         if st.session_state.current_round_index == -1:
                             st.session_state.current_round_index = 0
@@ -421,9 +1037,13 @@ def app():
                     round_title = rounds[min(st.session_state.current_round_index, len(rounds)-1)]
                     st.markdown(f"<h2 class='round-title'>Round: {round_title}</h2>", unsafe_allow_html=True)
                     
-                    df, current_match = calculate_rankings(st.session_state.current_round_index)
+                    with diagnostics.timer("ranking"):
+                        df, current_match = calculate_rankings(st.session_state.current_round_index)
                     
-                    if df is not None:
+                    render_start = time.perf_counter()
+                    if df is not None and st.session_state.table_mode == "Compact":
+                        display_ranking_table(df, current_match)
+                    elif df is not None:
                         def highlight_selected_team(team):
                             return 'background-color: yellow' if team == st.session_state.selected_team and st.session_state.selected_team != "Select a team to follow" else ''
                         
@@ -458,25 +1078,69 @@ def app():
                                 with col:
                                     if i == 5:
                                         if st.button("View Games", key=f"view_games_{team}_{current_match}_{idx}"):
-                                            st.session_state.viewed_team = team
-                                            st.session_state.viewed_competitor = row["Competitor"]
-                                            st.session_state.viewed_match = current_match
-                                            st.session_state.viewed_match_VPs = row["Match VPs"]
-                                            st.session_state.viewing_games = True
-                                            st.rerun()
+                                            open_games_view(row, current_match)
                                     else:
                                         style = highlight_selected_team(team) if i == 1 else ''
                                         st.markdown(f"<div style='{style}'>{value}</div>", unsafe_allow_html=True)
+                    diagnostics.add_time(f"render ({st.session_state.table_mode.lower()})", time.perf_counter() - render_start)
+                    
+                    if df is not None and st.session_state.show_projection and current_match < len(rounds) - 1:
+                        display_projection(current_match)
                 
                 # Refresh button in main GUI
-                if st.button("Refresh Data"):
-                    st.session_state.all_games_data = []
-                    st.session_state.cache_timestamp = None
-                    st.session_state.viewed_team = None
-                    st.session_state.viewed_match = None
-                    st.session_state.viewing_games = False
-                    st.session_state.data_loaded = False
-                    st.rerun()
+                page_cache = scraper.get_page_cache()
+                st.caption(f"Page cache: {page_cache.hits} hits, {page_cache.misses} misses")
+                event = st.session_state.event
+                if event is not None and event.missing_teams():
+                    if st.session_state.background_fill:
+                        event.fill_in_background()
+                    st.caption(f"Game details loaded for {len(event.loaded_teams)} of {len(event.teams_data)} teams")
+                if 'refresh_summary' in st.session_state:
+                    st.caption(st.session_state.refresh_summary)
+                if st.session_state.snapshot_saved_at:
+                    st.caption(f"Offline snapshot saved at {time.strftime('%Y-%m-%d %H:%M', time.localtime(st.session_state.snapshot_saved_at))}")
+                
+                col_refresh, col_update, col_archive, col_snapshot = st.columns([1, 1, 1, 1])
+                with col_refresh:
+                    if st.button("Refresh Data"):
+                        get_event_store().invalidate(st.session_state.results_url)
+                        st.session_state.event = None
+                        st.session_state.game_store = GameStore.from_records([])
+                        st.session_state.cache_timestamp = None
+                        st.session_state.viewed_team = None
+                        st.session_state.viewed_match = None
+                        st.session_state.viewing_games = False
+                        st.session_state.data_loaded = False
+                        st.rerun()
+                with col_update:
+                    if st.button("Update Changed Teams"):
+                        with st.spinner("Checking for new results..."):
+                            changed_count = refresh_changed_teams()
+                        if changed_count is not None:
+                            st.session_state.refresh_summary = f"Updated {changed_count} team(s) at {time.strftime('%H:%M:%S')}"
+                            st.rerun()
+                with col_archive:
+                    if st.button("Save to Archive", disabled=st.session_state.event is None):
+                        with diagnostics.timer("archive"):
+                            save_to_archive()
+                        st.session_state.refresh_summary = f"Archived at {time.strftime('%H:%M:%S')}"
+                        st.rerun()
+                with col_snapshot:
+                    if not snapshots.SNAPSHOTS_AVAILABLE:
+                        st.button("Save Snapshot", disabled=True, help="Snapshots need pyarrow")
+                    elif event is not None and event.missing_teams():
+                        if st.button("Prepare Snapshot"):
+                            load_games(event.missing_teams())
+                            st.rerun()
+                    else:
+                        st.download_button(
+                            "Save Snapshot",
+                            snapshot_data(),
+                            file_name=f"{st.session_state.event_title}{snapshots.SNAPSHOT_EXTENSION}",
+                            mime="application/vnd.apache.arrow.file"
+                        )
+                
+                display_diagnostics()
 
 if __name__ == "__main__":
     app()
\ No newline at end of file
@@ -0,0 +1,264 @@
+"""Local SQLite archive of scraped events.
+
+Stores each event's teams, per-round VPs, penalties and games, so results can be
+queried across events without scraping them again. Run as a script to archive
+events, list them or print a team's VP trend:
+
+    python bridge_archive.py archive URL [URL ...]
+    python bridge_archive.py list
+    python bridge_archive.py trend "Team name" --events 20
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+import bridge_scraper as scraper
+
+ARCHIVE_PATH = os.environ.get("BRIDGEFOLLOW_ARCHIVE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "bridgefollow_archive.sqlite3"))
+TREND_EVENTS = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    archived_at REAL NOT NULL,
+    schema TEXT
+);
+CREATE TABLE IF NOT EXISTS teams (
+    event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    penalty REAL NOT NULL,
+    personal_url TEXT,
+    PRIMARY KEY (event_id, team)
+);
+CREATE TABLE IF NOT EXISTS team_rounds (
+    event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    team TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    vp REAL NOT NULL,
+    PRIMARY KEY (event_id, team, round)
+);
+CREATE TABLE IF NOT EXISTS games (
+    event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    team TEXT NOT NULL,
+    match INTEGER NOT NULL,
+    board TEXT NOT NULL,
+    contract TEXT,
+    score REAL,
+    imp REAL,
+    lead TEXT
+);
+CREATE INDEX IF NOT EXISTS events_by_time ON events(archived_at);
+CREATE INDEX IF NOT EXISTS teams_by_name ON teams(team, event_id);
+CREATE INDEX IF NOT EXISTS games_by_event ON games(event_id, match, board);
+CREATE INDEX IF NOT EXISTS games_by_team ON games(team, event_id);
+"""
+
+# Final standings of the events a team played: total VPs, rounds played and rank in the field
+TREND_QUERY = """
+WITH totals AS (
+    SELECT t.event_id, t.team, t.penalty + COALESCE(SUM(r.vp), 0) AS total_vps,
+           COUNT(CASE WHEN r.vp != 0 THEN 1 END) AS rounds
+    FROM teams t LEFT JOIN team_rounds r ON r.event_id = t.event_id AND r.team = t.team
+    WHERE t.event_id IN (SELECT event_id FROM teams WHERE team = ?)
+    GROUP BY t.event_id, t.team
+), ranked AS (
+    SELECT *, RANK() OVER (PARTITION BY event_id ORDER BY total_vps DESC) AS position,
+           COUNT(*) OVER (PARTITION BY event_id) AS field
+    FROM totals
+)
+SELECT e.url, e.title, e.archived_at, ranked.rounds, ranked.total_vps, ranked.position, ranked.field
+FROM ranked JOIN events e ON e.id = ranked.event_id
+WHERE ranked.team = ?
+ORDER BY e.archived_at DESC
+LIMIT ?
+"""
+
+# Scores and IMPs are scraped as text with a decimal comma
+def _number(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        return float(str(value).replace(',', '.'))
+    except ValueError:
+        return None
+
+# One SQLite connection per thread; archiving an event replaces any earlier copy of it
+class Archive:
+    def __init__(self, path=ARCHIVE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA foreign_keys = ON")
+            connection.execute("PRAGMA journal_mode = WAL")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    connection.executescript(SCHEMA)
+                    # Archives written before events stored their schema
+                    if "schema" not in [row[1] for row in connection.execute("PRAGMA table_info(events)")]:
+                        connection.execute("ALTER TABLE events ADD COLUMN schema TEXT")
+                    self._schema_ready = True
+            self._local.connection = connection
+        return connection
+
+    # schema is the event's EventSchema as a dict, if known
+    def save_event(self, url, event_title, teams, games, archived_at=None, schema=None):
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM events WHERE url = ?", (url,))
+            event_id = connection.execute(
+                "INSERT INTO events (url, title, archived_at, schema) VALUES (?, ?, ?, ?)",
+                (url, event_title, archived_at or time.time(), json.dumps(schema) if schema else None)
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO teams (event_id, position, team, penalty, personal_url) VALUES (?, ?, ?, ?, ?)",
+                [(event_id, i, team["name"], team["penalty"], team["personal_url"]) for i, team in enumerate(teams)]
+            )
+            connection.executemany(
+                "INSERT INTO team_rounds (event_id, team, round, vp) VALUES (?, ?, ?, ?)",
+                [(event_id, team["name"], round_number, vp) for team in teams for round_number, vp in enumerate(team["matches"], 1)]
+            )
+            connection.executemany(
+                "INSERT INTO games (event_id, team, match, board, contract, score, imp, lead) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (event_id, game["team"], int(game["match"]), str(game["board"]), game["contract"],
+                     _number(game["score"]), _number(game["imp"]), game["lead"])
+                    for game in games
+                ]
+            )
+        return event_id
+
+    def delete_event(self, url):
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM events WHERE url = ?", (url,))
+
+    # Read queries on an archive that was never written return nothing rather than creating it
+    def exists(self):
+        return os.path.exists(self.path)
+
+    # Archived events, newest first
+    def events(self, limit=None):
+        if not self.exists():
+            return []
+        rows = self._connection().execute(
+            "SELECT e.url, e.title, e.archived_at, (SELECT COUNT(*) FROM teams t WHERE t.event_id = e.id) "
+            "FROM events e ORDER BY e.archived_at DESC LIMIT ?",
+            (-1 if limit is None else limit,)
+        ).fetchall()
+        return [{"url": url, "title": title, "archived_at": archived_at, "teams": teams} for url, title, archived_at, teams in rows]
+
+    # Returns (event_title, teams_data, games, archived_at, schema) in the scraper's shapes, or None.
+    # schema is the stored EventSchema dict or None.
+    def load_event(self, url):
+        connection = self._connection()
+        event = connection.execute("SELECT id, title, archived_at, schema FROM events WHERE url = ?", (url,)).fetchone()
+        if event is None:
+            return None
+        event_id, event_title, archived_at, schema = event
+        
+        teams = [
+            {"name": team, "matches": [], "penalty": penalty, "personal_url": personal_url}
+            for team, penalty, personal_url in connection.execute(
+                "SELECT team, penalty, personal_url FROM teams WHERE event_id = ? ORDER BY position", (event_id,)
+            )
+        ]
+        by_name = {team["name"]: team for team in teams}
+        for team, vp in connection.execute("SELECT team, vp FROM team_rounds WHERE event_id = ? ORDER BY team, round", (event_id,)):
+            by_name[team]["matches"].append(vp)
+        
+        games = [
+            {"team": team, "match": match, "board": board, "contract": contract, "score": score, "imp": imp, "lead": lead}
+            for team, match, board, contract, score, imp, lead in connection.execute(
+                "SELECT team, match, board, contract, score, imp, lead FROM games WHERE event_id = ? ORDER BY rowid", (event_id,)
+            )
+        ]
+        return event_title, teams, games, archived_at, json.loads(schema) if schema else None
+
+    # A team's final standings in its last `events` archived events, oldest first
+    def team_vp_trend(self, team, events=TREND_EVENTS):
+        if not self.exists():
+            return []
+        rows = self._connection().execute(TREND_QUERY, (team, team, events)).fetchall()
+        return [
+            {"url": url, "title": title, "archived_at": archived_at, "rounds": rounds,
+             "total_vps": total_vps, "position": position, "field": field}
+            for url, title, archived_at, rounds, total_vps, position, field in reversed(rows)
+        ]
+
+    # Every table's result on one board of an archived event
+    def board_results(self, url, match, board):
+        rows = self._connection().execute(
+            "SELECT g.team, g.contract, g.score, g.imp, g.lead FROM games g JOIN events e ON e.id = g.event_id "
+            "WHERE e.url = ? AND g.match = ? AND g.board = ? ORDER BY g.rowid",
+            (url, match, str(board))
+        ).fetchall()
+        return [{"team": team, "contract": contract, "score": score, "imp": imp, "lead": lead} for team, contract, score, imp, lead in rows]
+
+_archive = None
+_archive_lock = threading.Lock()
+
+def get_archive():
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = Archive()
+        return _archive
+
+# Scrape each event in full and archive it; returns the (url, error) pairs that failed
+def archive_events(urls, archive=None, diagnostics=None):
+    archive = archive or get_archive()
+    failed = []
+    for url in urls:
+        try:
+            event_title, teams, schema = scraper.scrape_event(url, diagnostics)
+        except Exception as e:
+            failed.append((url, e))
+            continue
+        if not teams:
+            failed.append((url, scraper.ScrapeError("No teams found in the results table")))
+            continue
+        games = scraper.load_all_match_details(teams, url, diagnostics=diagnostics)
+        archive.save_event(url, event_title, teams, games, schema=schema.to_dict())
+    return failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive bridge.co.il events and query them across events.")
+    parser.add_argument("--archive", default=ARCHIVE_PATH, help="SQLite archive file (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive_parser = commands.add_parser("archive", help="scrape and archive events")
+    archive_parser.add_argument("urls", nargs="+", metavar="URL", help="total1.php results page URL")
+    commands.add_parser("list", help="list archived events")
+    trend_parser = commands.add_parser("trend", help="print a team's VP trend")
+    trend_parser.add_argument("team")
+    trend_parser.add_argument("--events", type=int, default=TREND_EVENTS, help="number of recent events (default: %(default)s)")
+    args = parser.parse_args(argv)
+    
+    archive = Archive(args.archive)
+    if args.command == "archive":
+        failed = archive_events(args.urls, archive)
+        for url, error in failed:
+            print(f"Failed to archive {url}: {error}", file=sys.stderr)
+        return 1 if failed else 0
+    if args.command == "list":
+        for event in archive.events():
+            print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(event['archived_at']))}  {event['teams']:>4} teams  {event['title']}  {event['url']}")
+        return 0
+    for row in archive.team_vp_trend(args.team, args.events):
+        print(f"{time.strftime('%Y-%m-%d', time.localtime(row['archived_at']))}  {row['total_vps']:8.2f} VP  "
+              f"{row['position']:>3}/{row['field']:<3}  {row['rounds']:>3} rounds  {row['title']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
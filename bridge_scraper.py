@@ -0,0 +1,924 @@
+"""Headless scraper for bridge.co.il event results.
+
+Fetches and parses total1.php results pages and personal1.php team pages without
+any Streamlit dependency, so it can run from cron jobs and batch pipelines. Run as
+a script to export one or more events:
+
+    python bridge_scraper.py URL [URL ...] --format parquet --output-dir exports
+"""
+import os
+import sys
+import csv
+import json
+import time
+import queue
+import hashlib
+import argparse
+import threading
+import importlib.util
+import multiprocessing
+from collections import deque
+from contextlib import contextmanager
+import requests
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urljoin, urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+FETCH_WORKERS = 8
+PARSE_WORKERS = int(os.environ.get("BRIDGEFOLLOW_PARSE_WORKERS", "0"))  # 0 parses on the fetch threads
+PARSE_QUEUE_SIZE = 16  # fetched pages allowed to wait for a parse worker
+PER_HOST_LIMIT = 4
+REQUEST_TIMEOUT = 30
+RESULTS_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+PERSONAL_HEADERS = {'User-Agent': 'Mozilla/5.0'}
+DEFAULT_VIEWER_URL = "https://www.bridge.co.il/viewer/"
+DEBUG_LEVEL = int(os.environ.get("BRIDGEFOLLOW_DEBUG", "0"))
+MAX_DEBUG_LEVEL = 2
+DIAGNOSTIC_EVENTS = 500
+CACHE_DIR = os.environ.get("BRIDGEFOLLOW_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".page_cache"))
+CACHE_TTL = 24 * 60 * 60
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+LIVE_MIN_INTERVAL = 30
+LIVE_MAX_INTERVAL = 10 * 60
+LIVE_BACKOFF = 1.5
+LIVE_IDLE_TIMEOUT = 15 * 60
+PARSE_VERSION = 4  # bump when parsed output changes so cached parse results are discarded
+MATCHES_PER_DAY = 7  # day length assumed when the results page does not group rounds into days
+RESULTS_TRAILING_COLUMNS = 2  # total and penalty columns after the rounds
+
+class ScrapeError(Exception):
+    pass
+
+# Per-session instrumentation: a bounded ring buffer of parse events (recorded only when
+# level > 0; 1 = per team/match, 2 = per row), per-phase timers and bytes downloaded per URL.
+class Diagnostics:
+    def __init__(self, level=DEBUG_LEVEL, max_events=DIAGNOSTIC_EVENTS):
+        self.level = min(max(level, 0), MAX_DEBUG_LEVEL)
+        self.events = deque(maxlen=max_events)
+        self.phases = {}
+        self.downloads = {}
+        self._lock = threading.Lock()
+
+    # Messages are %-formatted only when they are going to be kept
+    def log(self, level, message, *args):
+        if level <= self.level:
+            message = message % args if args else message
+            with self._lock:
+                self.events.append((time.time(), message))
+
+    def add_time(self, phase, seconds):
+        with self._lock:
+            stats = self.phases.setdefault(phase, {"count": 0, "total_s": 0.0, "last_s": 0.0, "max_s": 0.0})
+            stats["count"] += 1
+            stats["total_s"] += seconds
+            stats["last_s"] = seconds
+            stats["max_s"] = max(stats["max_s"], seconds)
+
+    @contextmanager
+    def timer(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.perf_counter() - start)
+
+    def add_download(self, url, size, status, seconds):
+        with self._lock:
+            self.downloads[url] = {"bytes": size, "status": status, "seconds": seconds}
+        self.add_time("fetch", seconds)
+
+    # Copies of phases, downloads and events taken under the lock, safe to read while
+    # background threads keep recording
+    def snapshot(self):
+        with self._lock:
+            return (
+                {phase: dict(stats) for phase, stats in self.phases.items()},
+                {url: dict(item) for url, item in self.downloads.items()},
+                list(self.events)
+            )
+
+    def reset(self):
+        with self._lock:
+            self.events.clear()
+            self.phases.clear()
+            self.downloads.clear()
+
+    def to_json(self):
+        phases, downloads, events = self.snapshot()
+        return json.dumps({
+            "level": self.level,
+            "phases": phases,
+            "downloads": downloads,
+            "bytes_total": sum(item["bytes"] for item in downloads.values()),
+            "events": [{"time": stamp, "message": message} for stamp, message in events]
+        }, ensure_ascii=False, indent=2)
+
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+def _host_slot(url):
+    host = urlsplit(url).netloc
+    with _host_slots_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return _host_slots[host]
+
+# Shared keep-alive session with retry/backoff on transient errors
+_session = None
+_page_cache = None
+_parse_pools = {}
+_singleton_lock = threading.Lock()
+
+def get_http_session():
+    global _session
+    with _singleton_lock:
+        if _session is None:
+            _session = _new_http_session()
+        return _session
+
+def _new_http_session():
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=PER_HOST_LIMIT, pool_maxsize=FETCH_WORKERS, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# On-disk response cache keyed by URL. Entries keep the page body, its validators
+# and the parsed result, so an unchanged page is neither downloaded nor re-parsed.
+# An entry's file mtime is the time it was last validated against the server.
+class PageCache:
+    def __init__(self, directory, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url):
+        path = self._path(url)
+        with self._lock:
+            try:
+                if time.time() - os.path.getmtime(path) > self.ttl:
+                    os.remove(path)
+                    return None
+                with open(path, encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return None
+
+    def put(self, url, entry):
+        path = self._path(url)
+        with self._lock:
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(path + '.tmp', path)
+            self._evict()
+
+    def touch(self, url):
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def store_parsed(self, url, parsed):
+        entry = self.get(url)
+        if entry is not None:
+            entry['parsed'] = parsed
+            entry['parse_version'] = PARSE_VERSION
+            self.put(url, entry)
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self):
+        with self._lock:
+            for item in os.scandir(self.directory):
+                if item.name.endswith('.json'):
+                    os.remove(item.path)
+
+    # Drop least recently validated entries until the cache fits in max_bytes
+    def _evict(self):
+        files = [(item.stat().st_mtime, item.stat().st_size, item.path)
+                 for item in os.scandir(self.directory) if item.name.endswith('.json')]
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+def get_page_cache():
+    global _page_cache
+    with _singleton_lock:
+        if _page_cache is None:
+            _page_cache = PageCache(CACHE_DIR)
+        return _page_cache
+
+# Process pools for HTML parsing, one per worker count, started on first use. Workers are
+# spawned rather than forked since the parent may be running fetch and poller threads.
+def get_parse_pool(workers):
+    with _singleton_lock:
+        if workers not in _parse_pools:
+            _parse_pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _parse_pools[workers]
+
+def _discard_parse_pool(workers, pool):
+    with _singleton_lock:
+        if _parse_pools.get(workers) is pool:
+            del _parse_pools[workers]
+    pool.shutdown(wait=False)
+
+def _cached_parse(entry):
+    return entry.get('parsed') if entry.get('parse_version') == PARSE_VERSION else None
+
+def fetch_page(url, headers, diagnostics=None):
+    return fetch_cached(url, headers, diagnostics)[0]
+
+# Conditional GET through the page cache. Returns (html, parsed) where parsed is the
+# stored parse result when the page is unchanged since it was cached, otherwise None.
+def fetch_cached(url, headers, diagnostics=None):
+    cache = get_page_cache()
+    entry = cache.get(url)
+    request_headers = dict(headers)
+    if entry:
+        if entry.get('etag'):
+            request_headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            request_headers['If-Modified-Since'] = entry['last_modified']
+    
+    start = time.perf_counter()
+    with _host_slot(url):
+        response = get_http_session().get(url, headers=request_headers, timeout=REQUEST_TIMEOUT)
+    if diagnostics is not None:
+        diagnostics.add_download(url, len(response.content), response.status_code, time.perf_counter() - start)
+    
+    if response.status_code == 304 and entry:
+        cache.touch(url)
+        cache.record(hit=True)
+        return entry['body'], _cached_parse(entry)
+    
+    response.encoding = 'utf-8'
+    html = response.text
+    if not response.ok:
+        cache.record(hit=False)
+        return html, None
+    
+    body_hash = hashlib.sha1(html.encode('utf-8')).hexdigest()
+    unchanged = entry is not None and entry.get('hash') == body_hash
+    cache.record(hit=unchanged)
+    cache.put(url, {
+        "url": url,
+        "etag": response.headers.get('ETag'),
+        "last_modified": response.headers.get('Last-Modified'),
+        "hash": body_hash,
+        "body": html,
+        "parsed": entry.get('parsed') if unchanged else None,
+        "parse_version": entry.get('parse_version') if unchanged else None
+    })
+    return html, _cached_parse(entry) if unchanged else None
+
+# Fetch pages on a bounded worker pool, yielding (index, html, parsed, error) as each one completes
+def fetch_pages_concurrently(urls, headers, max_workers=FETCH_WORKERS, diagnostics=None):
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch_cached, url, headers, diagnostics): i for i, url in enumerate(urls) if url}
+        for future in as_completed(futures):
+            try:
+                html, parsed = future.result()
+                yield futures[future], html, parsed, None
+            except Exception as e:
+                yield futures[future], None, None, e
+
+# BeautifulSoup is imported on first parse; only tables with the given classes are built
+def _parse_tables(html, classes):
+    from bs4 import BeautifulSoup, SoupStrainer
+    return BeautifulSoup(html, HTML_PARSER, parse_only=SoupStrainer('table', attrs={'class': classes}))
+
+# Map each cell role to the index of the first cell carrying its class
+def resolve_column_roles(cols):
+    roles = {}
+    for i, col in enumerate(cols):
+        classes = col.get('class', [])
+        for role in ('rank', 'contract', 'lead'):
+            if role in classes and role not in roles:
+                roles[role] = i
+        if 'res' in classes and 'resns' not in classes and 'resew' not in classes and 'res' not in roles:
+            roles['res'] = i
+    return roles
+
+# Personal page links are relative to the results page they were scraped from
+def personal_page_url(personal_url, results_url=None):
+    if not personal_url:
+        return None
+    return urljoin(results_url or DEFAULT_VIEWER_URL, personal_url)
+
+# An event's round schedule and results-table layout, read once from the page headers.
+# matches_per_day holds the number of rounds played on each day; round_labels is built once.
+class EventSchema:
+    def __init__(self, round_count, matches_per_day=None, round_start=4):
+        if matches_per_day is None:
+            full_days, last_day = divmod(round_count, MATCHES_PER_DAY)
+            matches_per_day = [MATCHES_PER_DAY] * full_days + ([last_day] if last_day else [])
+        self.round_count = round_count
+        self.matches_per_day = tuple(matches_per_day)
+        self.round_start = round_start
+        self.round_labels = tuple(
+            f"Day {day} - Match {first + match}"
+            for day, first, count in self._days()
+            for match in range(1, count + 1)
+        )
+
+    def _days(self):
+        first = 0
+        for day, count in enumerate(self.matches_per_day, 1):
+            yield day, first, count
+            first += count
+
+    @property
+    def day_count(self):
+        return len(self.matches_per_day)
+
+    def to_dict(self):
+        return {"round_count": self.round_count, "matches_per_day": list(self.matches_per_day), "round_start": self.round_start}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["round_count"], data["matches_per_day"], data.get("round_start", 4))
+
+    # Schema for teams whose layout is unknown, e.g. teams restored from an archive
+    @classmethod
+    def for_teams(cls, teams):
+        return cls(max((len(team["matches"]) for team in teams or []), default=0))
+
+def _span(cell, attribute):
+    try:
+        return max(int(cell.get(attribute, 1)), 1)
+    except ValueError:
+        return 1
+
+# Expand header rows into a grid with one entry per table column, (text, colspan), carrying
+# cells with a rowspan down into the rows below them so every row lines up with the columns
+def _header_grid(header_rows):
+    grid = []
+    carried = {}  # column -> [(text, colspan), rows still covered]
+    for row in header_rows:
+        row_cells = row.find_all(['th', 'td'])
+        cells = []
+        i = 0
+        while i < len(row_cells) or len(cells) in carried:
+            entry = carried.get(len(cells))
+            if entry is not None:
+                cells.append(entry[0])
+                entry[1] -= 1
+                if not entry[1]:
+                    del carried[len(cells) - 1]
+                continue
+            cell = row_cells[i]
+            i += 1
+            text, colspan, rowspan = cell.get_text(strip=True), _span(cell, 'colspan'), _span(cell, 'rowspan')
+            for _ in range(colspan):
+                if rowspan > 1:
+                    carried[len(cells)] = [(text, colspan), rowspan - 1]
+                cells.append((text, colspan))
+        grid.append(cells)
+    return grid
+
+# Read the schema from the results table's header rows. Round columns are the run of header
+# cells labelled 1, 2, 3, ...; a header row whose cells span the round columns in groups gives
+# the rounds played each day, the finest such row when there are several (e.g. below a title
+# cell spanning every round). Without numbered headers the rounds are taken to fill the row
+# up to the total and penalty columns.
+def parse_event_schema(header_rows, row_width):
+    grid = _header_grid(header_rows)
+    round_start = round_count = None
+    for cells in grid:
+        labels = [text for text, _ in cells]
+        if "1" in labels:
+            round_start = labels.index("1")
+            round_count = 0
+            while round_start + round_count < len(labels) and labels[round_start + round_count] == str(round_count + 1):
+                round_count += 1
+            break
+    if round_count is None:
+        round_start = 4
+        round_count = max(row_width - round_start - RESULTS_TRAILING_COLUMNS, 0)
+    
+    matches_per_day = None
+    for cells in grid:
+        cells = cells[round_start:round_start + round_count]
+        if len(cells) != round_count or all(span == 1 for _, span in cells):
+            continue
+        spans = []
+        i = 0
+        while i < len(cells):
+            spans.append(cells[i][1])
+            i += cells[i][1]
+        if sum(spans) == round_count and len(spans) > len(matches_per_day or ()):
+            matches_per_day = spans
+    return EventSchema(round_count, matches_per_day, round_start)
+
+# Scrape a total1.php results page. Returns (event_title, teams_data, schema); event_title is
+# None when the page has no title row and teams_data is None when the table has no teams.
+def scrape_event(url, diagnostics=None):
+    html, parsed = fetch_cached(url, RESULTS_HEADERS, diagnostics)
+    if parsed is not None:
+        return parsed["event_title"], parsed["teams"], EventSchema.from_dict(parsed["schema"])
+    
+    parse_start = time.perf_counter()
+    event_title, teams_data, schema = parse_results_page(html)
+    if diagnostics is not None:
+        diagnostics.add_time("parse", time.perf_counter() - parse_start)
+    get_page_cache().store_parsed(url, {"event_title": event_title, "teams": teams_data, "schema": schema.to_dict()})
+    return event_title, teams_data, schema
+
+# Returns (event_title, teams_data), see scrape_event
+def scrape_team_data(url, diagnostics=None):
+    return scrape_event(url, diagnostics)[:2]
+
+def parse_results_page(html):
+    soup = _parse_tables(html, ['eventInfo', 'resultsTable'])
+    
+    event_title = None
+    event_info = soup.find('table', {'class': 'eventInfo'})
+    if event_info:
+        title_row = event_info.find('tr', {'class': 'eventInfoTitle'})
+        if title_row:
+            event_title = title_row.find('td').text.strip()
+    
+    table = soup.find('table', {'class': 'resultsTable'})
+    
+    if not table:
+        raise ScrapeError("Could not find results table in the page")
+        
+    teams_data = []
+    
+    # Header rows are the leading rows without results; there is always at least one
+    rows = table.find_all('tr')
+    header_count = 1
+    while header_count < len(rows) and not rows[header_count].find('bdo') and not rows[header_count].find('a'):
+        header_count += 1
+    data_rows = [cols for cols in (row.find_all('td') for row in rows[header_count:]) if len(cols) >= 5]
+    schema = parse_event_schema(rows[:header_count], max((len(cols) for cols in data_rows), default=0))
+    round_stop = schema.round_start + schema.round_count
+    
+    for cols in data_rows:
+        name_link = cols[1].find('a')
+        name = name_link.text.strip() if name_link else cols[1].text.strip()
+        personal_url = name_link['href'] if name_link and name_link.has_attr('href') else None
+        
+        matches = [0.0] * schema.round_count
+        for i, col in enumerate(cols[schema.round_start:round_stop]):
+            bdo = col.find('bdo')
+            if bdo:
+                match_score_text = bdo.text.strip().replace(',', '.')
+                try:
+                    matches[i] = float(match_score_text)
+                except ValueError:
+                    pass
+        
+        penalty_col = cols[-1].find('bdo')
+        penalty = 0.0
+        if penalty_col:
+            penalty_text = penalty_col.text.strip().replace(',', '.').replace(' ', '')
+            if penalty_text and penalty_text != '.':
+                try:
+                    penalty = float(penalty_text)
+                except ValueError:
+                    penalty = 0.0
+        
+        teams_data.append({
+            "name": name,
+            "matches": matches,
+            "penalty": penalty,
+            "personal_url": personal_url
+        })
+    
+    return event_title, teams_data if teams_data else None, schema
+
+# Game rows start at the first row with a board link; the rows above it are match headers
+def _first_game_row(rows):
+    for i, row in enumerate(rows):
+        board_cell = row.find('td', class_='rank')
+        if board_cell is not None and board_cell.find('a'):
+            return i
+    return len(rows)
+
+# Score text for the other side
+def _negate(score):
+    return score[1:] if score.startswith('-') else '-' + score
+
+# Parse match details from a team's personal page
+def parse_match_details(team_name, html, diagnostics=None):
+    diagnostics = diagnostics or Diagnostics(level=0)
+    parse_start = time.perf_counter()
+    try:
+        soup = _parse_tables(html, 'mpersonal')
+        
+        all_games = []
+        match_tables = soup.find_all('table', {'class': 'mpersonal'})
+        diagnostics.log(1, "Team %s: Found %d match tables", team_name, len(match_tables))
+        
+        for table in match_tables:
+            match_link = table.find('a', href=lambda x: x and 'round=' in x)
+            if not match_link:
+                diagnostics.log(1, "Team %s: No match link in table", team_name)
+                continue
+            
+            try:
+                match_number = int(match_link['href'].split('round=')[1].split('&')[0])
+            except:
+                diagnostics.log(1, "Team %s: Failed to extract match number", team_name)
+                continue
+            
+            diagnostics.log(1, "Team %s: Processing match %d", team_name, match_number)
+            
+            rows = table.find_all('tr')
+            start_index = _first_game_row(rows)
+            game_rows = rows[start_index:]
+            diagnostics.log(1, "Team %s, Match %d: Found %d game rows", team_name, match_number, len(game_rows))
+            
+            # Rows share a handful of layouts, so roles are resolved once per distinct row layout
+            layout_roles = {}
+            for row in game_rows:
+                cols = row.find_all('td')
+                if len(cols) < 6:
+                    diagnostics.log(2, "Team %s, Match %d: Skipped row - %d cols", team_name, match_number, len(cols))
+                    continue
+                
+                layout = tuple(tuple(col.get('class', ())) for col in cols)
+                roles = layout_roles.get(layout)
+                if roles is None:
+                    roles = layout_roles[layout] = resolve_column_roles(cols)
+                
+                board = ""
+                if 'rank' in roles:
+                    board_link = cols[roles['rank']].find('a')
+                    board = board_link.text.strip() if board_link and any(c.isdigit() for c in board_link.text.strip()) else ""
+                if not board:
+                    diagnostics.log(2, "Team %s, Match %d: Skipped row - no board", team_name, match_number)
+                    continue
+                
+                contract = cols[roles['contract']].get_text(strip=True) if 'contract' in roles else ""
+                if not contract or 'NP' in contract.upper():
+                    diagnostics.log(2, "Team %s, Match %d: Skipped row - no contract: '%s'", team_name, match_number, contract)
+                    continue
+                
+                lead = ""
+                if 'lead' in roles:
+                    lead_col = cols[roles['lead']]
+                    lead_bdo = lead_col.find('bdo')
+                    lead = lead_bdo.get_text(strip=True) if lead_bdo else lead_col.get_text(strip=True)
+                if not lead and len(cols) >= 3:
+                    lead = cols[-3].get_text(strip=True)
+                
+                imp = cols[roles['res']].get_text(strip=True) if 'res' in roles else ""
+                
+                # Scores are kept from NS's side: an EW score is negated
+                ns_score = cols[0].get_text(strip=True)
+                ew_score = cols[1].get_text(strip=True)
+                score = ns_score if ns_score else _negate(ew_score) if ew_score else ""
+                
+                game_data = {
+                    "team": team_name,
+                    "match": match_number,
+                    "board": board,
+                    "contract": contract,
+                    "score": score,
+                    "imp": imp,
+                    "lead": lead
+                }
+                all_games.append(game_data)
+                diagnostics.log(2, "Team %s, Match %d, Board %s: Added game - contract=%s, imp=%s, lead=%s, score=%s", team_name, match_number, board, contract, imp, lead, score)
+        
+        diagnostics.log(1, "Team %s: Total games collected: %d", team_name, len(all_games))
+        return all_games
+    except Exception as e:
+        diagnostics.log(1, "Team %s: Error - %s", team_name, e)
+        return []
+    finally:
+        diagnostics.add_time("parse", time.perf_counter() - parse_start)
+
+# Get match details
+def get_all_match_details(team_name, personal_url, results_url=None, diagnostics=None):
+    if not personal_url:
+        return []
+    
+    full_url = personal_page_url(personal_url, results_url)
+    try:
+        html, parsed = fetch_cached(full_url, PERSONAL_HEADERS, diagnostics)
+    except Exception as e:
+        if diagnostics is not None:
+            diagnostics.log(1, "Team %s: Error - %s", team_name, e)
+        return []
+    if parsed is not None:
+        return parsed
+    games = parse_match_details(team_name, html, diagnostics)
+    get_page_cache().store_parsed(full_url, games)
+    return games
+
+# Runs in a parse worker process; returns plain game dicts and the parse time
+def _parse_in_worker(team_name, html):
+    start = time.perf_counter()
+    games = parse_match_details(team_name, html)
+    return games, time.perf_counter() - start
+
+# Fetch and parse on the fetch threads, yielding (team index, games, error)
+def _threaded_match_details(teams, urls, diagnostics, fetch_workers):
+    for i, html, parsed, error in fetch_pages_concurrently(urls, PERSONAL_HEADERS, fetch_workers, diagnostics):
+        if error is not None:
+            yield i, None, error
+        elif parsed is not None:
+            yield i, parsed, None
+        else:
+            games = parse_match_details(teams[i]['name'], html, diagnostics)
+            get_page_cache().store_parsed(urls[i], games)
+            yield i, games, None
+
+# Two-stage pipeline: fetch threads download pages and hand them to a process pool for
+# parsing, yielding (team index, games, error). The hand-off is bounded: fetch threads block
+# once queue_size pages are waiting for or in a parse, so memory stays flat however far
+# downloads run ahead of parsing. If the pool breaks, it is discarded and pages are parsed
+# in this process instead.
+def _pipelined_match_details(teams, urls, diagnostics, fetch_workers, parse_workers, queue_size=PARSE_QUEUE_SIZE):
+    pool = get_parse_pool(parse_workers)
+    slots = threading.BoundedSemaphore(queue_size)
+    results = queue.Queue()
+    
+    def parse_here(i, html, error):
+        _discard_parse_pool(parse_workers, pool)
+        if diagnostics is not None:
+            diagnostics.log(1, "Team %s: Parse pool failed, parsing in process - %s", teams[i]['name'], error)
+        results.put((i, *_parse_in_worker(teams[i]['name'], html), None))
+    
+    def parsed(i, html, future):
+        slots.release()
+        try:
+            games, seconds = future.result()
+        except BrokenProcessPool as e:
+            parse_here(i, html, e)
+            return
+        results.put((i, games, seconds, None))
+    
+    def fetch(i):
+        try:
+            html, games = fetch_cached(urls[i], PERSONAL_HEADERS, diagnostics)
+        except Exception as e:
+            results.put((i, None, None, e))
+            return
+        if games is not None:
+            results.put((i, games, None, None))
+            return
+        slots.acquire()
+        try:
+            future = pool.submit(_parse_in_worker, teams[i]['name'], html)
+        except BrokenProcessPool as e:
+            slots.release()
+            parse_here(i, html, e)
+            return
+        future.add_done_callback(lambda future: parsed(i, html, future))
+    
+    pending = [i for i, url in enumerate(urls) if url]
+    with ThreadPoolExecutor(max_workers=fetch_workers) as executor:
+        for i in pending:
+            executor.submit(fetch, i)
+        for _ in pending:
+            i, games, seconds, error = results.get()
+            if seconds is not None:
+                if diagnostics is not None:
+                    diagnostics.add_time("parse", seconds)
+                get_page_cache().store_parsed(urls[i], games)
+            yield i, games, error
+
+# Yield (team index, games) for each team as its personal page completes. With parse_workers
+# set, pages are parsed on a process pool instead of the fetch threads.
+def iter_match_details(teams, results_url=None, diagnostics=None, max_workers=FETCH_WORKERS, parse_workers=PARSE_WORKERS):
+    urls = [personal_page_url(team['personal_url'], results_url) for team in teams]
+    if parse_workers:
+        pages = _pipelined_match_details(teams, urls, diagnostics, max_workers, parse_workers)
+    else:
+        pages = _threaded_match_details(teams, urls, diagnostics, max_workers)
+    for i, games, error in pages:
+        if error is not None:
+            if diagnostics is not None:
+                diagnostics.log(1, "Team %s: Error - %s", teams[i]['name'], error)
+            yield i, []
+        else:
+            yield i, games
+
+# Fetch all personal pages concurrently, parsing each as it arrives
+def load_all_match_details(teams, results_url=None, on_progress=None, diagnostics=None):
+    games_by_team = [[] for _ in teams]
+    done = sum(1 for team in teams if not team['personal_url'])
+    for i, games in iter_match_details(teams, results_url, diagnostics):
+        games_by_team[i] = games
+        done += 1
+        if on_progress:
+            on_progress(teams[i]['name'], done, len(teams))
+    return [game for games in games_by_team for game in games]
+
+# Teams that are new or whose matches vector or penalty differ from old_teams
+def changed_teams(old_teams, new_teams):
+    old = {team["name"]: team for team in old_teams or []}
+    return [
+        team for team in new_teams
+        if team["name"] not in old
+        or old[team["name"]]["matches"] != team["matches"]
+        or old[team["name"]]["penalty"] != team["penalty"]
+    ]
+
+# Number of rounds up to the last one where any team has a non-zero result
+def completed_rounds(teams):
+    completed = 0
+    for team in teams:
+        for i in range(len(team["matches"]) - 1, completed - 1, -1):
+            if team["matches"][i]:
+                completed = i + 1
+                break
+    return completed
+
+# Background poller for one event's results page. Polls on an adaptive interval that backs
+# off while nothing changes, fetches personal pages only for teams whose results changed,
+# and bumps version so readers compare a single integer. The thread exits when nobody has
+# called touch() for idle_timeout seconds and is restarted by the next touch().
+class EventPoller:
+    def __init__(self, results_url, min_interval=LIVE_MIN_INTERVAL, max_interval=LIVE_MAX_INTERVAL,
+                 backoff=LIVE_BACKOFF, idle_timeout=LIVE_IDLE_TIMEOUT):
+        self.results_url = results_url
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self.interval = min_interval
+        self.version = 0
+        self.event_title = None
+        self.teams_data = None
+        self.schema = None
+        self.completed_rounds = 0
+        self.last_poll = None
+        self.last_error = None
+        self._team_games = {}
+        self._last_seen = time.time()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def touch(self):
+        self._last_seen = time.time()
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name=f"EventPoller {self.results_url}", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set() and time.time() - self._last_seen < self.idle_timeout:
+            self.poll()
+            self._stop.wait(self.interval)
+
+    def _back_off(self):
+        self.interval = min(self.interval * self.backoff, self.max_interval)
+
+    # One poll of the results page; returns True when new results were published
+    def poll(self):
+        try:
+            event_title, teams, schema = scrape_event(self.results_url)
+        except Exception as e:
+            self.last_error = e
+            self.last_poll = time.time()
+            self._back_off()
+            return False
+        self.last_error = None
+        self.last_poll = time.time()
+        
+        changed = changed_teams(self.teams_data, teams or [])
+        if not teams or (self.teams_data is not None and not changed):
+            self._back_off()
+            return False
+        
+        games = {}
+        if self.teams_data is not None:
+            for i, team_games in iter_match_details(changed, self.results_url):
+                games[changed[i]["name"]] = team_games
+        
+        with self._lock:
+            self.version += 1
+            self._team_games.update(games)
+            self.event_title = event_title
+            self.teams_data = teams
+            self.schema = schema
+            self.completed_rounds = completed_rounds(teams)
+        self.interval = self.min_interval
+        return True
+
+    # Games the poller already fetched for teams that changed while it was running
+    def team_games(self):
+        with self._lock:
+            return dict(self._team_games)
+
+TEAM_FIELDS = ["event_url", "event_title", "team", "round", "vp", "penalty", "personal_url"]
+GAME_FIELDS = ["event_url", "team", "match", "board", "contract", "score", "imp", "lead"]
+
+# Export sinks take rows in batches and write them out as they arrive
+class CsvSink:
+    def __init__(self, path, fields):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=fields, extrasaction='ignore')
+        self._writer.writeheader()
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class ParquetSink:
+    NUMERIC_FIELDS = {"round": "int16", "match": "int16", "vp": "float64", "penalty": "float64"}
+
+    def __init__(self, path, fields):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self._schema = pa.schema([(field, self.NUMERIC_FIELDS.get(field, "string")) for field in fields])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows):
+        if rows:
+            self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+# Scrape each event and stream its teams (one row per team and round) and games into
+# teams.<format> and games.<format>. Games are written per team in completion order.
+def export_events(urls, output_dir, file_format="csv", diagnostics=None, parse_workers=PARSE_WORKERS):
+    sink = CsvSink if file_format == "csv" else ParquetSink
+    os.makedirs(output_dir, exist_ok=True)
+    teams_sink = sink(os.path.join(output_dir, f"teams.{file_format}"), TEAM_FIELDS)
+    games_sink = sink(os.path.join(output_dir, f"games.{file_format}"), GAME_FIELDS)
+    failed = []
+    try:
+        for url in urls:
+            try:
+                event_title, teams = scrape_team_data(url, diagnostics)
+            except Exception as e:
+                failed.append((url, e))
+                continue
+            if not teams:
+                failed.append((url, ScrapeError("No teams found in the results table")))
+                continue
+            
+            teams_sink.write([
+                {
+                    "event_url": url,
+                    "event_title": event_title,
+                    "team": team["name"],
+                    "round": round_number,
+                    "vp": vp,
+                    "penalty": team["penalty"],
+                    "personal_url": team["personal_url"]
+                }
+                for team in teams
+                for round_number, vp in enumerate(team["matches"], 1)
+            ])
+            for _, games in iter_match_details(teams, url, diagnostics, parse_workers=parse_workers):
+                games_sink.write([dict(game, event_url=url) for game in games])
+    finally:
+        teams_sink.close()
+        games_sink.close()
+    return failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export teams and games from bridge.co.il events.")
+    parser.add_argument("urls", nargs="+", metavar="URL", help="total1.php results page URL")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="output file format (default: csv)")
+    parser.add_argument("--output-dir", default=".", help="directory for teams and games files (default: current directory)")
+    parser.add_argument("--parse-workers", type=int, default=PARSE_WORKERS,
+                        help="parse pages on this many worker processes; 0 parses on the fetch threads (default: %(default)s)")
+    args = parser.parse_args(argv)
+    
+    failed = export_events(args.urls, args.output_dir, args.format, parse_workers=args.parse_workers)
+    for url, error in failed:
+        print(f"Failed to export {url}: {error}", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
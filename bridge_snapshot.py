@@ -0,0 +1,108 @@
+"""Snapshots of a loaded event for instant, offline startup.
+
+A snapshot is an Arrow IPC file. The games are stored as a zstd-compressed
+columnar table with dictionary-encoded text columns. The event's metadata and
+teams data are stored as versioned JSON in the table's schema metadata.
+
+Loading a snapshot is a full decode: every game batch is decompressed and
+converted to a pandas frame for the GameStore, and the teams data is parsed in
+full. Only read_snapshot_info is partial, reading the schema metadata without
+touching the games. Files on disk are opened through a memory map, but the
+compressed buffers are still copied when they are decompressed; the trade-off
+favours small files over zero-copy reads. Requires pyarrow.
+"""
+import io
+import json
+import time
+import importlib.util
+
+SNAPSHOTS_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+SNAPSHOT_FORMAT = "bridgefollow-snapshot"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_COMPRESSION = "zstd"
+SNAPSHOT_EXTENSION = ".bfsnap"
+METADATA_KEY = b"bridgefollow"
+
+class SnapshotError(Exception):
+    pass
+
+class Snapshot:
+    def __init__(self, results_url, event_title, teams_data, cache_timestamp, saved_at, games, schema=None):
+        self.results_url = results_url
+        self.event_title = event_title
+        self.teams_data = teams_data
+        self.cache_timestamp = cache_timestamp
+        self.saved_at = saved_at
+        self.games = games  # pandas frame in GameStore's layout
+        self.schema = schema  # EventSchema dict, None in snapshots taken before schemas were stored
+
+# Write a snapshot to target (a path or a binary file object). games is a GameStore frame
+# and schema the event's EventSchema as a dict.
+def save_snapshot(target, results_url, event_title, teams_data, games, cache_timestamp=None, schema=None, compression=SNAPSHOT_COMPRESSION):
+    import pyarrow as pa
+    metadata = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "results_url": results_url,
+        "event_title": event_title,
+        "cache_timestamp": cache_timestamp,
+        "saved_at": time.time(),
+        "schema": schema,
+        "teams_data": teams_data
+    }
+    table = pa.Table.from_pandas(games, preserve_index=False)
+    table = table.replace_schema_metadata({METADATA_KEY: json.dumps(metadata, ensure_ascii=False).encode("utf-8")})
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_file(target, table.schema, options=options) as writer:
+        writer.write_table(table)
+
+def snapshot_bytes(results_url, event_title, teams_data, games, cache_timestamp=None, schema=None):
+    buffer = io.BytesIO()
+    save_snapshot(buffer, results_url, event_title, teams_data, games, cache_timestamp, schema)
+    return buffer.getvalue()
+
+def _open(source):
+    import pyarrow as pa
+    if isinstance(source, str):
+        source = pa.memory_map(source)
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        source = pa.BufferReader(source)
+    elif hasattr(source, "getvalue"):
+        source = pa.BufferReader(source.getvalue())
+    try:
+        return pa.ipc.open_file(source)
+    except pa.ArrowInvalid as e:
+        raise SnapshotError(f"Not a snapshot file: {e}")
+
+def _metadata(reader):
+    try:
+        metadata = json.loads((reader.schema.metadata or {})[METADATA_KEY])
+    except (KeyError, ValueError):
+        raise SnapshotError("Not a bridgeFollow snapshot")
+    if metadata.get("format") != SNAPSHOT_FORMAT:
+        raise SnapshotError("Not a bridgeFollow snapshot")
+    if metadata.get("version", 0) > SNAPSHOT_VERSION:
+        raise SnapshotError(f"Snapshot version {metadata['version']} is newer than this app supports ({SNAPSHOT_VERSION})")
+    return metadata
+
+# Read only the header: everything but the games (the teams data is still parsed to count it)
+def read_snapshot_info(source):
+    metadata = _metadata(_open(source))
+    info = {key: value for key, value in metadata.items() if key != "teams_data"}
+    info["teams"] = len(metadata["teams_data"])
+    return info
+
+# Read a snapshot from a path (memory-mapped), bytes or a binary file object, decoding all of it
+def load_snapshot(source):
+    reader = _open(source)
+    metadata = _metadata(reader)
+    games = reader.read_all().to_pandas()
+    return Snapshot(
+        metadata["results_url"],
+        metadata["event_title"],
+        metadata["teams_data"],
+        metadata.get("cache_timestamp"),
+        metadata["saved_at"],
+        games,
+        metadata.get("schema")
+    )
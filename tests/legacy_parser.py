@@ -0,0 +1,132 @@
+"""The results and personal page parsers as they were before parsing was limited to the
+scraped tables, kept as the reference for the parity tests. Logging and caching are
+left out; the parsing itself is unchanged.
+"""
+from bs4 import BeautifulSoup
+
+# Returns (event_title, teams_data); teams_data is None when the table has no teams
+def parse_results_page(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    event_title = None
+    event_info = soup.find('table', {'class': 'eventInfo'})
+    if event_info:
+        title_row = event_info.find('tr', {'class': 'eventInfoTitle'})
+        if title_row:
+            event_title = title_row.find('td').text.strip()
+    
+    table = soup.find('table', {'class': 'resultsTable'})
+    if not table:
+        return event_title, None
+    
+    teams_data = []
+    for row in table.find_all('tr')[1:]:
+        cols = row.find_all('td')
+        if len(cols) < 5:
+            continue
+        
+        name_link = cols[1].find('a')
+        name = name_link.text.strip() if name_link else cols[1].text.strip()
+        personal_url = name_link['href'] if name_link and name_link.has_attr('href') else None
+        
+        matches = []
+        for col in cols[4:32]:
+            bdo = col.find('bdo')
+            if bdo:
+                match_score_text = bdo.text.strip().replace(',', '.')
+                try:
+                    matches.append(float(match_score_text))
+                except ValueError:
+                    matches.append(0.0)
+            else:
+                matches.append(0.0)
+        
+        penalty_col = cols[-1].find('bdo')
+        penalty = 0.0
+        if penalty_col:
+            penalty_text = penalty_col.text.strip().replace(',', '.').replace(' ', '')
+            if penalty_text and penalty_text != '.':
+                try:
+                    penalty = float(penalty_text)
+                except ValueError:
+                    penalty = 0.0
+        
+        teams_data.append({
+            "name": name,
+            "matches": matches,
+            "penalty": penalty,
+            "personal_url": personal_url
+        })
+    
+    return event_title, teams_data if teams_data else None
+
+def parse_match_details(team_name, html):
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    all_games = []
+    for table in soup.find_all('table', {'class': 'mpersonal'}):
+        match_link = table.find('a', href=lambda x: x and 'round=' in x)
+        if not match_link:
+            continue
+        
+        try:
+            match_number = int(match_link['href'].split('round=')[1].split('&')[0])
+        except:
+            continue
+        
+        rows = table.find_all('tr')
+        start_index = 4
+        game_rows = rows[start_index:]
+        
+        for row in game_rows:
+            cols = row.find_all('td')
+            if len(cols) < 6:
+                continue
+            
+            board = ""
+            for col in cols:
+                if 'rank' in col.get('class', []):
+                    board_link = col.find('a')
+                    board = board_link.text.strip() if board_link and any(c.isdigit() for c in board_link.text.strip()) else ""
+                    break
+            if not board:
+                continue
+            
+            contract = ""
+            for col in cols:
+                if 'contract' in col.get('class', []):
+                    contract = col.get_text(strip=True)
+                    break
+            
+            if not contract or 'NP' in contract.upper():
+                continue
+            
+            lead = ""
+            for col in cols:
+                if 'lead' in col.get('class', []):
+                    lead = col.find('bdo').get_text(strip=True) if col.find('bdo') else col.get_text(strip=True)
+                    break
+            if not lead and len(cols) >= 3:
+                lead = cols[-3].get_text(strip=True)
+            
+            imp = ""
+            for col in cols:
+                if 'res' in col.get('class', []) and 'resns' not in col.get('class', []) and 'resew' not in col.get('class', []):
+                    imp = col.get_text(strip=True)
+                    break
+            
+            ns_score = cols[0].get_text(strip=True) if cols[0].get_text(strip=True) else ""
+            ew_score = cols[1].get_text(strip=True) if cols[1].get_text(strip=True) else ""
+            score = ns_score if ns_score else ew_score if ew_score else ""
+            
+            all_games.append({
+                "team": team_name,
+                "match": match_number,
+                "board": board,
+                "contract": contract,
+                "score": score,
+                "imp": imp,
+                "lead": lead
+            })
+    
+    return all_games
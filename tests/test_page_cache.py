@@ -0,0 +1,112 @@
+"""Revalidation rules of the on-disk page cache, against the benchmarks' local stand-in server.
+
+Each test gets an empty cache directory and a small synthetic event served with ETags.
+"""
+import os
+import sys
+import time
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+import bridge_scraper as scraper
+from fixtures import generate_event
+from server import FixtureServer
+
+@pytest.fixture
+def page_cache(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setenv("BRIDGEFOLLOW_CACHE_DIR", cache_dir)
+    monkeypatch.setattr(scraper, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(scraper, "_page_cache", None)
+    return scraper.get_page_cache()
+
+@pytest.fixture
+def server(tmp_path):
+    directory = generate_event(str(tmp_path / "event"), teams=4, rounds=6, played=3, boards=2)
+    with FixtureServer(directory) as server:
+        yield server
+
+def fetch(url):
+    diagnostics = scraper.Diagnostics()
+    html, parsed = scraper.fetch_cached(url, scraper.RESULTS_HEADERS, diagnostics)
+    return html, parsed, diagnostics.downloads[url]["status"]
+
+def test_unchanged_page_revalidates_with_304(page_cache, server):
+    url = server.results_url
+    event_title, teams, _ = scraper.scrape_event(url)
+    assert (page_cache.hits, page_cache.misses) == (0, 1)
+    
+    # The stand-in only answers 304 when If-None-Match carries the stored ETag
+    html, parsed, status = fetch(url)
+    assert status == 304
+    assert (page_cache.hits, page_cache.misses) == (1, 1)
+    assert html == page_cache.get(url)["body"]
+    assert parsed["event_title"] == event_title
+    assert parsed["teams"] == teams
+
+def test_parse_version_change_discards_stored_parse(page_cache, server, monkeypatch):
+    url = server.results_url
+    scraper.scrape_event(url)
+    monkeypatch.setattr(scraper, "PARSE_VERSION", scraper.PARSE_VERSION + 1)
+    
+    html, parsed, status = fetch(url)
+    assert status == 304
+    assert parsed is None
+    
+    # Parsing again stores the result under the new version
+    scraper.scrape_event(url)
+    assert page_cache.get(url)["parse_version"] == scraper.PARSE_VERSION
+    assert fetch(url)[1] is not None
+
+def test_full_response_with_unchanged_body_is_a_hit(page_cache, server):
+    url = server.results_url
+    event_title, teams, _ = scraper.scrape_event(url)
+    
+    # A validator the server no longer recognises forces a 200 with the same body
+    entry = page_cache.get(url)
+    entry["etag"] = '"stale"'
+    page_cache.put(url, entry)
+    
+    html, parsed, status = fetch(url)
+    assert status == 200
+    assert (page_cache.hits, page_cache.misses) == (1, 1)
+    assert parsed["teams"] == teams
+    assert page_cache.get(url)["etag"] != '"stale"'
+
+def test_changed_body_is_a_miss(page_cache, server):
+    url = server.results_url
+    scraper.scrape_event(url)
+    with open(os.path.join(server.directory, "total.html"), "a", encoding="utf-8") as f:
+        f.write("<!-- updated -->")
+    
+    html, parsed, status = fetch(url)
+    assert status == 200
+    assert parsed is None
+    assert (page_cache.hits, page_cache.misses) == (0, 2)
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = scraper.PageCache(str(tmp_path), ttl=60)
+    cache.put("http://example/a", {"body": "a"})
+    assert cache.get("http://example/a") == {"body": "a"}
+    
+    stale = time.time() - 120
+    os.utime(cache._path("http://example/a"), (stale, stale))
+    assert cache.get("http://example/a") is None
+    assert not os.path.exists(cache._path("http://example/a"))
+
+def test_eviction_drops_least_recently_validated(tmp_path):
+    cache = scraper.PageCache(str(tmp_path), max_bytes=10 ** 6)
+    urls = [f"http://example/{i}" for i in range(3)]
+    for i, url in enumerate(urls):
+        cache.put(url, {"body": "x" * 1000})
+        validated = time.time() - 300 + i * 100
+        os.utime(cache._path(url), (validated, validated))
+    
+    # Revalidating the oldest entry makes the middle one least recent
+    cache.touch(urls[0])
+    cache.max_bytes = 2 * os.path.getsize(cache._path(urls[0]))
+    cache.put("http://example/new", {"body": "x" * 1000})
+    assert [os.path.exists(cache._path(url)) for url in urls] == [True, False, False]
+    assert os.path.exists(cache._path("http://example/new"))
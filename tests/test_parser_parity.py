@@ -0,0 +1,82 @@
+"""Parity of the scraper's parsers with the original ones (legacy_parser) on saved pages.
+
+The fixtures in tests/fixtures cover a flat results header, a two-row header with day
+groups, and personal pages with skipped rows, lead fallbacks, reordered columns and rows
+alternating between layouts. Every test runs with html.parser and, when installed, lxml.
+"""
+import os
+import sys
+import importlib.util
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bridge_scraper as scraper
+import legacy_parser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from fixtures import generate_event
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+HTML_PARSERS = ["html.parser"] + (["lxml"] if importlib.util.find_spec("lxml") else [])
+
+# page -> (round_count, matches_per_day, round_start)
+RESULTS_PAGES = {
+    "total_flat.html": (28, (7, 7, 7, 7), 4),
+    "total_days.html": (12, (6, 6), 4),
+}
+PERSONAL_PAGES = ["personal_standard.html", "personal_layouts.html"]
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+@pytest.fixture(params=HTML_PARSERS)
+def html_parser(request, monkeypatch):
+    monkeypatch.setattr(scraper, "HTML_PARSER", request.param)
+    return request.param
+
+def assert_results_parity(html):
+    legacy_title, legacy_teams = legacy_parser.parse_results_page(html)
+    event_title, teams, schema = scraper.parse_results_page(html)
+    assert event_title == legacy_title
+    assert [team["name"] for team in teams] == [team["name"] for team in legacy_teams]
+    for team, legacy in zip(teams, legacy_teams):
+        assert team["penalty"] == legacy["penalty"]
+        assert team["personal_url"] == legacy["personal_url"]
+        # The original parser always read 28 cells from the fifth column, running into the
+        # total and penalty columns on shorter events; the rounds themselves must agree
+        assert team["matches"] == legacy["matches"][:schema.round_count]
+    return schema
+
+# Scores now carry their side, EW scores negated; the original parser kept the bare text
+def assert_games_parity(team_name, html):
+    games = scraper.parse_match_details(team_name, html)
+    legacy_games = legacy_parser.parse_match_details(team_name, html)
+    assert [dict(game, score=game["score"].lstrip("-")) for game in games] == legacy_games
+    return games
+
+@pytest.mark.parametrize("page", list(RESULTS_PAGES))
+def test_results_page_parity(page, html_parser):
+    schema = assert_results_parity(_read(os.path.join(FIXTURES_DIR, page)))
+    assert (schema.round_count, schema.matches_per_day, schema.round_start) == RESULTS_PAGES[page]
+
+@pytest.mark.parametrize("page", PERSONAL_PAGES)
+def test_personal_page_parity(page, html_parser):
+    assert assert_games_parity("Team", _read(os.path.join(FIXTURES_DIR, page)))
+
+def test_ew_scores_are_negated(html_parser):
+    games = scraper.parse_match_details("Team", _read(os.path.join(FIXTURES_DIR, "personal_standard.html")))
+    scores = {(game["match"], game["board"]): game["score"] for game in games}
+    assert scores[(1, "1")] == "420"
+    assert scores[(1, "2")] == "-620"
+    assert scores[(2, "8")] == "-140"
+
+# Synthetic events from the benchmark fixtures, with a flat and a two-row results header
+@pytest.mark.parametrize("matches_per_day", [None, (4, 4, 2)])
+def test_synthetic_event_parity(matches_per_day, html_parser, tmp_path):
+    directory = generate_event(str(tmp_path), teams=6, rounds=10, played=6, boards=3, seed=2, matches_per_day=matches_per_day)
+    schema = assert_results_parity(_read(os.path.join(directory, "total.html")))
+    assert schema.round_count == 10
+    assert schema.matches_per_day == (matches_per_day or (7, 3))
+    for i in range(1, 7):
+        assert_games_parity(f"Team {i}", _read(os.path.join(directory, f"personal_{i}.html")))